@@ -2,21 +2,88 @@
 """
 Chart generator using QuickChart.io API.
 Python 3.7+ compatible, requires only requests library.
+NumPy is used for downsampling when installed (optional).
 """
-import json
 import logging
+import warnings
 from datetime import datetime, timedelta
 try:
     from urllib.parse import urlencode, quote
 except ImportError:
     from urllib import urlencode, quote
 
-import requests
+import json_utils
+from network_resilience import create_http_session
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Metrics averaged by downsample_sensor_data: (key, rounding digits or None for integer)
+DOWNSAMPLE_METRICS = (
+    ('temperature', 1),
+    ('humidity', None),
+    ('co2', None),
+    ('pressure', 1),
+    ('noise', None),
+    ('wind_strength', None),
+    ('gust_strength', None),
+    ('wind_angle', None),
+    ('rain', 1),
+    ('rain_1h', 1),
+    ('rain_24h', 1),
+    ('light_level', None),
+)
+
+
+def _parse_recorded_at(timestamp):
+    """Parse a recorded_at timestamp into a naive datetime."""
+    if 'T' in timestamp:
+        # Parse ISO format timestamp (remove timezone for consistent comparison)
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return dt.replace(tzinfo=None)
+    return datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+
+
+def _interval_keys_numpy(sensor_data, interval_seconds):
+    """
+    Compute interval keys for all readings with vectorized timestamp parsing.
+
+    Args:
+        sensor_data: List of sensor readings with 'recorded_at' keys
+        interval_seconds: Interval in seconds for grouping data points
+
+    Returns:
+        numpy.ndarray or None: Interval key per reading, or None if any timestamp
+        needs the per-reading parser (timezone suffix, invalid or missing value)
+    """
+    timestamps = [reading.get('recorded_at') for reading in sensor_data]
+    if not all(isinstance(ts, str) and len(ts) >= 19 for ts in timestamps):
+        return None
+
+    try:
+        with warnings.catch_warnings():
+            # Timezone-aware strings only warn; treat them as unsupported here
+            warnings.simplefilter('error')
+            parsed = np.array(timestamps, dtype='datetime64[us]')
+    except (ValueError, TypeError, UserWarning, DeprecationWarning):
+        return None
+    if np.isnat(parsed).any():
+        return None
+
+    # Seconds since first data point (truncated toward zero like int()), rounded to interval
+    offsets_us = (parsed - parsed[0]).astype(np.int64)
+    seconds_since_start = np.trunc(offsets_us / 1000000.0).astype(np.int64)
+    return (seconds_since_start // interval_seconds) * interval_seconds
 
 
 def downsample_sensor_data(sensor_data, interval_seconds):
     """
     Downsample sensor data by averaging values within each interval.
+    Uses NumPy for the per-interval aggregation when available.
 
     Args:
         sensor_data: List of sensor readings with 'recorded_at', 'temperature',
@@ -29,77 +96,106 @@ def downsample_sensor_data(sensor_data, interval_seconds):
     if not sensor_data or interval_seconds <= 0:
         return sensor_data
 
-    # Parse timestamps and group by interval
-    from datetime import datetime
+    if NUMPY_AVAILABLE:
+        interval_keys = _interval_keys_numpy(sensor_data, interval_seconds)
+        if interval_keys is not None:
+            return _downsample_numpy(sensor_data, interval_keys)
 
-    grouped = {}  # {interval_key: [readings]}
+    # Parse timestamps and compute interval keys
+    readings = []
+    interval_keys = []
     first_dt = None
 
     for reading in sensor_data:
-        timestamp = reading['recorded_at']
         try:
-            # Parse ISO format timestamp (remove timezone for consistent comparison)
-            if 'T' in timestamp:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                # Remove timezone info for consistent calculation
-                dt = dt.replace(tzinfo=None)
-            else:
-                dt = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+            dt = _parse_recorded_at(reading['recorded_at'])
+        except (ValueError, AttributeError):
+            # Skip invalid timestamps
+            continue
 
-            # Initialize reference point with first data point
-            if first_dt is None:
-                first_dt = dt
+        # Initialize reference point with first data point
+        if first_dt is None:
+            first_dt = dt
 
-            # Calculate interval key (seconds since first data point, rounded to interval)
-            seconds_since_start = int((dt - first_dt).total_seconds())
-            interval_key = (seconds_since_start // interval_seconds) * interval_seconds
+        # Calculate interval key (seconds since first data point, rounded to interval)
+        seconds_since_start = int((dt - first_dt).total_seconds())
+        interval_keys.append((seconds_since_start // interval_seconds) * interval_seconds)
+        readings.append(reading)
 
-            if interval_key not in grouped:
-                grouped[interval_key] = []
-            grouped[interval_key].append(reading)
-        except (ValueError, AttributeError) as e:
-            # Skip invalid timestamps
-            continue
+    if not readings:
+        return []
+
+    if NUMPY_AVAILABLE:
+        return _downsample_numpy(readings, interval_keys)
+
+    grouped = {}  # {interval_key: [readings]}
+    for interval_key, reading in zip(interval_keys, readings):
+        if interval_key not in grouped:
+            grouped[interval_key] = []
+        grouped[interval_key].append(reading)
 
     # Calculate averages for each interval
     result = []
     for interval_key in sorted(grouped.keys()):
-        readings = grouped[interval_key]
-        if not readings:
-            continue
+        group = grouped[interval_key]
 
         # Use the first reading's timestamp as the representative time
-        representative_timestamp = readings[0]['recorded_at']
+        item = {'recorded_at': group[0]['recorded_at']}
 
         # Calculate averages (ignore None values)
-        temps = [r['temperature'] for r in readings if r.get('temperature') is not None]
-        humids = [r['humidity'] for r in readings if r.get('humidity') is not None]
-        co2s = [r['co2'] for r in readings if r.get('co2') is not None]
-        pressures = [r['pressure'] for r in readings if r.get('pressure') is not None]
-        noises = [r['noise'] for r in readings if r.get('noise') is not None]
-        winds = [r['wind_strength'] for r in readings if r.get('wind_strength') is not None]
-        gusts = [r['gust_strength'] for r in readings if r.get('gust_strength') is not None]
-        wind_angles = [r['wind_angle'] for r in readings if r.get('wind_angle') is not None]
-        rains = [r['rain'] for r in readings if r.get('rain') is not None]
-        rains_1h = [r['rain_1h'] for r in readings if r.get('rain_1h') is not None]
-        rains_24h = [r['rain_24h'] for r in readings if r.get('rain_24h') is not None]
-        light_levels = [r['light_level'] for r in readings if r.get('light_level') is not None]
-
-        result.append({
-            'recorded_at': representative_timestamp,
-            'temperature': round(sum(temps) / len(temps), 1) if temps else None,
-            'humidity': round(sum(humids) / len(humids)) if humids else None,
-            'co2': round(sum(co2s) / len(co2s)) if co2s else None,
-            'pressure': round(sum(pressures) / len(pressures), 1) if pressures else None,
-            'noise': round(sum(noises) / len(noises)) if noises else None,
-            'wind_strength': round(sum(winds) / len(winds)) if winds else None,
-            'gust_strength': round(sum(gusts) / len(gusts)) if gusts else None,
-            'wind_angle': round(sum(wind_angles) / len(wind_angles)) if wind_angles else None,
-            'rain': round(sum(rains) / len(rains), 1) if rains else None,
-            'rain_1h': round(sum(rains_1h) / len(rains_1h), 1) if rains_1h else None,
-            'rain_24h': round(sum(rains_24h) / len(rains_24h), 1) if rains_24h else None,
-            'light_level': round(sum(light_levels) / len(light_levels)) if light_levels else None,
-        })
+        for metric, digits in DOWNSAMPLE_METRICS:
+            values = [r[metric] for r in group if r.get(metric) is not None]
+            item[metric] = round(sum(values) / len(values), digits) if values else None
+
+        result.append(item)
+
+    return result
+
+
+def _downsample_numpy(readings, interval_keys):
+    """
+    Average readings per interval with NumPy (same output as the pure Python path).
+
+    Args:
+        readings: List of sensor readings with valid timestamps
+        interval_keys: Interval key for each reading
+
+    Returns:
+        list: Downsampled sensor data with averaged values
+    """
+    # Sorted interval keys, index of each group's first reading, group index per reading
+    unique_keys, first_index, inverse = np.unique(
+        np.asarray(interval_keys, dtype=np.int64), return_index=True, return_inverse=True
+    )
+    inverse = inverse.ravel()
+    group_count = len(unique_keys)
+
+    # Keys present in any reading; metrics a source never has (e.g. wind for
+    # SwitchBot rows) are None everywhere and skip the per-reading scan
+    available = set().union(*readings)
+
+    # Per-metric sums and counts of non-None values for each interval
+    aggregates = []
+    for metric, digits in DOWNSAMPLE_METRICS:
+        if metric not in available:
+            aggregates.append((metric, digits, None, None))
+            continue
+        values = np.fromiter(
+            (r.get(metric) for r in readings), dtype=np.float64, count=len(readings)
+        )
+        present = ~np.isnan(values)
+        sums = np.bincount(inverse[present], weights=values[present], minlength=group_count)
+        counts = np.bincount(inverse[present], minlength=group_count)
+        aggregates.append((metric, digits, sums.tolist(), counts.tolist()))
+
+    result = []
+    for group, reading_index in enumerate(first_index.tolist()):
+        # Use the first reading's timestamp as the representative time
+        item = {'recorded_at': readings[reading_index]['recorded_at']}
+        for metric, digits, sums, counts in aggregates:
+            count = counts[group] if counts is not None else 0
+            item[metric] = round(sums[group] / count, digits) if count else None
+        result.append(item)
 
     return result
 
@@ -127,7 +223,7 @@ class ChartGenerator:
     BASE_URL = "https://quickchart.io/chart"
     SHORT_URL_API = "https://quickchart.io/chart/create"
 
-    def __init__(self, width=800, height=400, background_color='white'):
+    def __init__(self, width=800, height=400, background_color='white', session=None):
         """
         Initialize chart generator.
 
@@ -135,10 +231,12 @@ class ChartGenerator:
             width: Chart width in pixels
             height: Chart height in pixels
             background_color: Background color
+            session: Optional shared requests.Session (keep-alive for short-URL requests)
         """
         self.width = width
         self.height = height
         self.background_color = background_color
+        self.session = session or create_http_session()
 
     def _create_chart_config(self, chart_type, labels, datasets, title=None, options=None):
         """
@@ -200,7 +298,7 @@ class ChartGenerator:
 
     def _get_direct_url(self, config):
         """Get direct chart URL (may be long)."""
-        chart_json = json.dumps(config, separators=(',', ':'))
+        chart_json = json_utils.dumps(config).decode('utf-8')
         params = {
             'c': chart_json,
             'w': self.width,
@@ -218,9 +316,10 @@ class ChartGenerator:
                 'height': self.height,
                 'backgroundColor': self.background_color
             }
-            response = requests.post(
+            response = self.session.post(
                 self.SHORT_URL_API,
-                json=payload,
+                data=json_utils.dumps(payload),
+                headers={'Content-Type': 'application/json'},
                 timeout=10
             )
             response.raise_for_status()
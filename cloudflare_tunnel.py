@@ -4,11 +4,15 @@ Cloudflare Tunnel manager for exposing local webhook server.
 Python 3.7+ compatible, uses only standard library.
 """
 import logging
+import re
 import subprocess
 import threading
 import time
 import shutil
 
+# Quick tunnel URL printed by cloudflared
+QUICK_TUNNEL_URL_RE = re.compile(r'https://[^\s]+\.trycloudflare\.com')
+
 
 class CloudflareTunnel:
     """Manages cloudflared tunnel process."""
@@ -29,6 +33,8 @@ class CloudflareTunnel:
         self.thread = None
         self.public_url = None
         self._stop_event = threading.Event()
+        # Set as soon as public_url is known
+        self._url_ready = threading.Event()
 
     def _check_cloudflared(self):
         """Check if cloudflared is installed."""
@@ -77,11 +83,12 @@ class CloudflareTunnel:
 
         # Start output monitoring thread
         self._stop_event.clear()
+        self._url_ready.clear()
         self.thread = threading.Thread(target=self._monitor_output, daemon=True)
         self.thread.start()
 
-        # Wait a bit for tunnel to establish
-        time.sleep(3)
+        # Wait a bit for tunnel to establish (returns early once a quick tunnel URL is seen)
+        self._url_ready.wait(timeout=3)
 
         if self.process.poll() is not None:
             logging.error("cloudflared exited immediately with code %d", self.process.returncode)
@@ -90,6 +97,7 @@ class CloudflareTunnel:
         logging.info("Cloudflare tunnel started")
         if self.hostname:
             self.public_url = "https://{}".format(self.hostname)
+            self._url_ready.set()
             logging.info("Tunnel URL: %s", self.public_url)
 
         return True
@@ -111,10 +119,10 @@ class CloudflareTunnel:
                 # Try to extract URL from quick tunnel
                 if 'trycloudflare.com' in line or '.cloudflare' in line:
                     # Extract URL from output
-                    import re
-                    match = re.search(r'https://[^\s]+\.trycloudflare\.com', line)
+                    match = QUICK_TUNNEL_URL_RE.search(line)
                     if match:
                         self.public_url = match.group(0)
+                        self._url_ready.set()
                         logging.info("Quick tunnel URL: %s", self.public_url)
 
                 # Check for errors
@@ -147,8 +155,21 @@ class CloudflareTunnel:
                 self.process = None
 
         self.public_url = None
+        self._url_ready.clear()
         logging.info("Cloudflare tunnel stopped")
 
+    def wait_for_url(self, timeout=None):
+        """
+        Wait until the public URL is known.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            bool: True if public_url is available
+        """
+        return self._url_ready.wait(timeout)
+
     def is_running(self):
         """Check if tunnel is running."""
         return self.process is not None and self.process.poll() is None
@@ -10,6 +10,7 @@ Provides:
 """
 import json
 import logging
+import re
 import threading
 from datetime import datetime, timedelta
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -33,6 +34,9 @@ class DashboardHandler(BaseHTTPRequestHandler):
         'Video Doorbell'
     ]
 
+    # Device name keywords that mark an outdoor sensor
+    OUTDOOR_RE = re.compile('防水温湿度計|屋外|Outdoor|outdoor')
+
     # Track last event ID for polling
     last_event_id = 0
 
@@ -133,7 +137,6 @@ class DashboardHandler(BaseHTTPRequestHandler):
                 ''', self.SECURITY_DEVICE_TYPES)
 
             rows = cursor.fetchall()
-            conn.close()
 
             events = []
             for row in rows:
@@ -238,7 +241,6 @@ class DashboardHandler(BaseHTTPRequestHandler):
             ''', self.SECURITY_DEVICE_TYPES)
 
             history_by_name_rows = cursor.fetchall()
-            conn.close()
 
             # Build maps of latest history per device (by id and by name)
             latest_history_by_id = {}
@@ -482,11 +484,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
 
     def _is_outdoor_sensor(self, device_name):
         """Check if device is an outdoor sensor."""
-        outdoor_keywords = ['防水温湿度計', '屋外', 'Outdoor', 'outdoor']
-        for keyword in outdoor_keywords:
-            if keyword in device_name:
-                return True
-        return False
+        return self.OUTDOOR_RE.search(device_name) is not None
 
     def _serve_dashboard(self):
         """Serve dashboard HTML page."""
@@ -7,6 +7,7 @@ import sqlite3
 import json
 import logging
 import os
+import threading
 from datetime import datetime, timedelta
 
 
@@ -21,19 +22,74 @@ class DeviceDatabase:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        # Latest stored state per device: {device_id: (device_name, device_type, status_json)}
+        # Loaded on first save_device_state call; unchanged states skip the DB write
+        self._state_cache = None
+        self._state_cache_lock = threading.Lock()
+        # One long-lived connection per thread, so sqlite3's per-connection
+        # statement cache keeps hot queries compiled between calls
+        self._local = threading.local()
+        # Every open per-thread connection, so close() can reach them all at shutdown
+        self._connections = []  # [(thread, conn)]
+        self._connections_lock = threading.Lock()
         self._init_db()
 
     def _get_connection(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Get this thread's database connection (opened on first use).
+        Callers must not close it; use close() at shutdown.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Only this thread uses it; close() may close it from the shutdown thread
+            conn = sqlite3.connect(self.db_path, cached_statements=256, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # WAL (set in _init_db) is crash-safe with NORMAL: no fsync per commit
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            self._local.conn = conn
+            self._register_connection(conn)
+        elif conn.in_transaction:
+            # A previous call failed before commit; don't keep its write lock
+            conn.rollback()
         return conn
 
+    def _register_connection(self, conn):
+        """Track a new thread's connection, closing those of threads that have exited."""
+        current = threading.current_thread()
+        with self._connections_lock:
+            alive = []
+            for thread, other in self._connections:
+                if thread.is_alive():
+                    alive.append((thread, other))
+                else:
+                    other.close()
+            alive.append((current, conn))
+            self._connections = alive
+
+    def close(self):
+        """
+        Close every thread's database connection.
+        Call after the threads using the database have stopped; closing the
+        last connection checkpoints the WAL into the main database file.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logging.warning("Error closing database connection: %s", e)
+        self._local.conn = None
+
     def _init_db(self):
         """Initialize database tables."""
         conn = self._get_connection()
         cursor = conn.cursor()
 
+        # Write-ahead logging (persistent per database file)
+        cursor.execute('PRAGMA journal_mode=WAL')
+
         # Main table for latest device states
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS device_states (
@@ -84,6 +140,12 @@ class DeviceDatabase:
             ON sensor_timeseries(device_id, recorded_at)
         ''')
 
+        # Time-range index (all-device window reads and retention cleanup)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_timeseries_recorded_at
+            ON sensor_timeseries(recorded_at)
+        ''')
+
         # Netatmo time series table (includes pressure, noise, wind, rain)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS netatmo_timeseries (
@@ -116,6 +178,22 @@ class DeviceDatabase:
             ON netatmo_timeseries(device_id, recorded_at)
         ''')
 
+        # Time-range index (all-device window reads and retention cleanup)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_netatmo_timeseries_recorded_at
+            ON netatmo_timeseries(recorded_at)
+        ''')
+
+        # Last alert time per (alert type, device) so cooldowns survive restarts
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_cooldowns (
+                alert_type TEXT NOT NULL,
+                device_id TEXT NOT NULL,
+                last_alert_at REAL NOT NULL,
+                PRIMARY KEY (alert_type, device_id)
+            )
+        ''')
+
         # Migration: Add wind/rain columns to netatmo_timeseries if they don't exist
         self._migrate_netatmo_columns(cursor)
 
@@ -123,7 +201,6 @@ class DeviceDatabase:
         self._migrate_sensor_columns(cursor)
 
         conn.commit()
-        conn.close()
 
     def _migrate_netatmo_columns(self, cursor):
         """Add wind/rain columns to netatmo_timeseries if they don't exist."""
@@ -189,7 +266,6 @@ class DeviceDatabase:
             (device_id,)
         )
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return {
@@ -214,43 +290,57 @@ class DeviceDatabase:
         Returns:
             bool: True if state changed, False if same
         """
-        now = datetime.now().isoformat()
         status_json = json.dumps(status, sort_keys=True, ensure_ascii=False)
+        new_state = (device_name, device_type, status_json)
 
-        # Get existing state
-        existing = self.get_device_state(device_id)
+        with self._state_cache_lock:
+            if self._state_cache is None:
+                self._state_cache = self._load_state_cache()
 
-        # Check if state changed
-        state_changed = False
-        if existing:
-            existing_json = json.dumps(existing['status'], sort_keys=True, ensure_ascii=False)
-            state_changed = existing_json != status_json
-        else:
-            state_changed = True  # New device
+            # Nothing to write if the stored state is identical
+            existing = self._state_cache.get(device_id)
+            if existing == new_state:
+                return False
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
+            # Check if state changed (new device counts as changed)
+            state_changed = existing is None or existing[2] != status_json
 
-        # Upsert current state
-        cursor.execute('''
-            INSERT OR REPLACE INTO device_states
-            (device_id, device_name, device_type, status_json, updated_at)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (device_id, device_name, device_type, status_json, now))
+            now = datetime.now().isoformat()
+            conn = self._get_connection()
+            cursor = conn.cursor()
 
-        # Record history if changed
-        if state_changed:
+            # Upsert current state
             cursor.execute('''
-                INSERT INTO device_history
-                (device_id, device_name, device_type, status_json, recorded_at)
+                INSERT OR REPLACE INTO device_states
+                (device_id, device_name, device_type, status_json, updated_at)
                 VALUES (?, ?, ?, ?, ?)
             ''', (device_id, device_name, device_type, status_json, now))
 
-        conn.commit()
-        conn.close()
+            # Record history if changed
+            if state_changed:
+                cursor.execute('''
+                    INSERT INTO device_history
+                    (device_id, device_name, device_type, status_json, recorded_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (device_id, device_name, device_type, status_json, now))
+
+            conn.commit()
+
+            self._state_cache[device_id] = new_state
 
         return state_changed
 
+    def _load_state_cache(self):
+        """Load stored device states for save_device_state comparisons."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT device_id, device_name, device_type, status_json FROM device_states')
+        cache = {
+            row['device_id']: (row['device_name'], row['device_type'], row['status_json'])
+            for row in cursor.fetchall()
+        }
+        return cache
+
     def get_changes(self, device_id, old_status, new_status):
         """
         Detect what changed between two status dicts.
@@ -311,7 +401,6 @@ class DeviceDatabase:
         ''', (device_id, limit))
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -336,7 +425,6 @@ class DeviceDatabase:
 
         cursor.execute('SELECT * FROM device_states ORDER BY device_name')
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -366,7 +454,6 @@ class DeviceDatabase:
 
         deleted = cursor.rowcount
         conn.commit()
-        conn.close()
 
         return deleted
 
@@ -384,6 +471,64 @@ class DeviceDatabase:
         Returns:
             bool: True if data was saved
         """
+        row = self._sensor_row(device_id, device_name, status, datetime.now().isoformat())
+        if row is None:
+            return False
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO sensor_timeseries
+            (device_id, device_name, recorded_at, temperature, humidity, co2, battery, light_level)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', row)
+
+        conn.commit()
+
+        return True
+
+    def save_sensor_data_bulk(self, items):
+        """
+        Save sensor time series data for multiple devices in a single transaction.
+
+        Args:
+            items: List of (device_id, device_name, status) tuples
+
+        Returns:
+            list: Saved flag (bool) for each item, in input order
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        saved_flags = []
+
+        for device_id, device_name, status in items:
+            row = self._sensor_row(device_id, device_name, status, now)
+            saved_flags.append(row is not None)
+            if row is not None:
+                rows.append(row)
+
+        if not rows:
+            return saved_flags
+
+        conn = self._get_connection()
+        with conn:
+            conn.executemany('''
+                INSERT INTO sensor_timeseries
+                (device_id, device_name, recorded_at, temperature, humidity, co2, battery, light_level)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+        return saved_flags
+
+    @staticmethod
+    def _sensor_row(device_id, device_name, status, recorded_at):
+        """
+        Build a sensor_timeseries row from a device status.
+
+        Returns:
+            tuple or None: Row values, or None if the status has no sensor data
+        """
         # Extract sensor values
         temperature = status.get('temperature')
         humidity = status.get('humidity')
@@ -406,23 +551,9 @@ class DeviceDatabase:
 
         # Only save if there's sensor data
         if temperature is None and humidity is None and co2 is None and light_level is None:
-            return False
-
-        now = datetime.now().isoformat()
-
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO sensor_timeseries
-            (device_id, device_name, recorded_at, temperature, humidity, co2, battery, light_level)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (device_id, device_name, now, temperature, humidity, co2, battery, light_level))
-
-        conn.commit()
-        conn.close()
+            return None
 
-        return True
+        return (device_id, device_name, recorded_at, temperature, humidity, co2, battery, light_level)
 
     def get_sensor_data_for_date(self, device_id, date_str=None):
         """
@@ -449,7 +580,6 @@ class DeviceDatabase:
         ''', (device_id, date_str))
 
         rows = cursor.fetchall()
-        conn.close()
 
         result = []
         for row in rows:
@@ -492,30 +622,62 @@ class DeviceDatabase:
             WHERE device_id = ?
             AND recorded_at >= ?
             ORDER BY recorded_at ASC
-        ''', (device_id, start_time.strftime('%Y-%m-%d %H:%M:%S')))
+        ''', (device_id, self._isoformat_bound(start_time)))
 
-        rows = cursor.fetchall()
-        conn.close()
+        return [self._sensor_reading(row) for row in cursor.fetchall()]
 
-        result = []
-        for row in rows:
-            item = {
-                'device_id': row['device_id'],
-                'device_name': row['device_name'],
-                'recorded_at': row['recorded_at'],
-                'temperature': row['temperature'],
-                'humidity': row['humidity'],
-                'co2': row['co2'],
-                'battery': row['battery']
-            }
-            # Add light_level if it exists in the schema
-            try:
-                item['light_level'] = row['light_level']
-            except (IndexError, KeyError):
-                item['light_level'] = None
-            result.append(item)
+    def get_all_sensor_data_last_hours(self, hours=24):
+        """
+        Get sensor data of all devices for the specified number of hours
+        in one query.
+
+        Args:
+            hours: Number of hours to retrieve (default: 24)
+
+        Returns:
+            dict: {device_id: list of sensor readings (oldest first)}
+        """
+        start_time = datetime.now() - timedelta(hours=hours)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM sensor_timeseries
+            WHERE recorded_at >= ?
+            ORDER BY recorded_at ASC
+        ''', (self._isoformat_bound(start_time),))
+
+        # Range scan on the recorded_at index; rows stay time-ordered per device
+        result = {}
+        for row in cursor.fetchall():
+            result.setdefault(row['device_id'], []).append(self._sensor_reading(row))
         return result
 
+    @staticmethod
+    def _isoformat_bound(dt):
+        """Format a time bound like stored recorded_at values (isoformat, 'T' separator)."""
+        return dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+    @staticmethod
+    def _sensor_reading(row):
+        """Convert a sensor_timeseries row to a reading dict."""
+        item = {
+            'device_id': row['device_id'],
+            'device_name': row['device_name'],
+            'recorded_at': row['recorded_at'],
+            'temperature': row['temperature'],
+            'humidity': row['humidity'],
+            'co2': row['co2'],
+            'battery': row['battery']
+        }
+        # Add light_level if it exists in the schema
+        try:
+            item['light_level'] = row['light_level']
+        except (IndexError, KeyError):
+            item['light_level'] = None
+        return item
+
     def get_sensor_data_last_24h(self, device_id):
         """
         Get sensor data for the last 24 hours.
@@ -553,7 +715,6 @@ class DeviceDatabase:
         ''', (device_id, start_date, end_date))
 
         rows = cursor.fetchall()
-        conn.close()
 
         result = []
         for row in rows:
@@ -597,7 +758,6 @@ class DeviceDatabase:
 
         updated = cursor.rowcount
         conn.commit()
-        conn.close()
 
         if updated > 0:
             logging.info(
@@ -629,7 +789,6 @@ class DeviceDatabase:
         ''')
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {'device_id': row['device_id'], 'device_name': row['device_name']}
@@ -671,7 +830,6 @@ class DeviceDatabase:
         ''', (device_id, date_str))
 
         row = cursor.fetchone()
-        conn.close()
 
         if row and row['count'] > 0:
             return {
@@ -715,7 +873,6 @@ class DeviceDatabase:
 
         deleted = cursor.rowcount
         conn.commit()
-        conn.close()
 
         return deleted
 
@@ -779,10 +936,63 @@ class DeviceDatabase:
               rain, rain_1h, rain_24h, battery_percent))
 
         conn.commit()
-        conn.close()
 
         return True
 
+    def save_netatmo_data_bulk(self, readings):
+        """
+        Save multiple Netatmo readings in a single transaction.
+
+        Args:
+            readings: List of reading dicts as returned by
+                      NetatmoAPI.get_all_sensor_readings()
+
+        Returns:
+            list: Saved flag (bool) for each reading, in input order
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        saved_flags = []
+
+        for reading in readings:
+            # Only save if there's any sensor data
+            has_data = any(
+                reading.get(key) is not None
+                for key in ('temperature', 'humidity', 'co2', 'pressure',
+                            'noise', 'wind_strength', 'rain')
+            )
+            saved_flags.append(has_data)
+            if not has_data:
+                continue
+
+            rows.append((
+                reading['device_id'], reading['device_name'],
+                reading.get('station_name', ''), reading.get('module_type', ''),
+                1 if reading.get('is_outdoor') else 0,
+                now, reading.get('temperature'), reading.get('humidity'),
+                reading.get('co2'), reading.get('pressure'), reading.get('noise'),
+                reading.get('wind_strength'), reading.get('wind_angle'),
+                reading.get('gust_strength'), reading.get('gust_angle'),
+                reading.get('rain'), reading.get('rain_1h'), reading.get('rain_24h'),
+                reading.get('battery_percent')
+            ))
+
+        if not rows:
+            return saved_flags
+
+        conn = self._get_connection()
+        with conn:
+            conn.executemany('''
+                INSERT INTO netatmo_timeseries
+                (device_id, device_name, station_name, module_type, is_outdoor,
+                 recorded_at, temperature, humidity, co2, pressure, noise,
+                 wind_strength, wind_angle, gust_strength, gust_angle,
+                 rain, rain_1h, rain_24h, battery_percent)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+        return saved_flags
+
     def get_netatmo_data_for_date(self, device_id, date_str=None):
         """
         Get Netatmo sensor data for a specific date.
@@ -808,7 +1018,6 @@ class DeviceDatabase:
         ''', (device_id, date_str))
 
         rows = cursor.fetchall()
-        conn.close()
 
         result = []
         for row in rows:
@@ -870,49 +1079,75 @@ class DeviceDatabase:
             WHERE device_id = ?
             AND recorded_at >= ?
             ORDER BY recorded_at ASC
-        ''', (device_id, start_time.strftime('%Y-%m-%d %H:%M:%S')))
+        ''', (device_id, self._isoformat_bound(start_time)))
 
-        rows = cursor.fetchall()
-        conn.close()
+        return [self._netatmo_reading(row) for row in cursor.fetchall()]
 
-        result = []
-        for row in rows:
-            item = {
-                'device_id': row['device_id'],
-                'device_name': row['device_name'],
-                'station_name': row['station_name'],
-                'module_type': row['module_type'],
-                'is_outdoor': bool(row['is_outdoor']),
-                'recorded_at': row['recorded_at'],
-                'temperature': row['temperature'],
-                'humidity': row['humidity'],
-                'co2': row['co2'],
-                'pressure': row['pressure'],
-                'noise': row['noise'],
-                'battery_percent': row['battery_percent']
-            }
-            # Add wind/rain fields if they exist in the schema
-            try:
-                item['wind_strength'] = row['wind_strength']
-                item['wind_angle'] = row['wind_angle']
-                item['gust_strength'] = row['gust_strength']
-                item['gust_angle'] = row['gust_angle']
-                item['rain'] = row['rain']
-                item['rain_1h'] = row['rain_1h']
-                item['rain_24h'] = row['rain_24h']
-            except (IndexError, KeyError):
-                # Old schema without wind/rain columns
-                item['wind_strength'] = None
-                item['wind_angle'] = None
-                item['gust_strength'] = None
-                item['gust_angle'] = None
-                item['rain'] = None
-                item['rain_1h'] = None
-                item['rain_24h'] = None
-            result.append(item)
+    def get_all_netatmo_data_last_hours(self, hours=24):
+        """
+        Get Netatmo sensor data of all devices for the specified number of hours
+        in one query.
+
+        Args:
+            hours: Number of hours to retrieve (default: 24)
+
+        Returns:
+            dict: {device_id: list of sensor readings (oldest first)}
+        """
+        start_time = datetime.now() - timedelta(hours=hours)
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM netatmo_timeseries
+            WHERE recorded_at >= ?
+            ORDER BY recorded_at ASC
+        ''', (self._isoformat_bound(start_time),))
 
+        # Range scan on the recorded_at index; rows stay time-ordered per device
+        result = {}
+        for row in cursor.fetchall():
+            result.setdefault(row['device_id'], []).append(self._netatmo_reading(row))
         return result
 
+    @staticmethod
+    def _netatmo_reading(row):
+        """Convert a netatmo_timeseries row to a reading dict."""
+        item = {
+            'device_id': row['device_id'],
+            'device_name': row['device_name'],
+            'station_name': row['station_name'],
+            'module_type': row['module_type'],
+            'is_outdoor': bool(row['is_outdoor']),
+            'recorded_at': row['recorded_at'],
+            'temperature': row['temperature'],
+            'humidity': row['humidity'],
+            'co2': row['co2'],
+            'pressure': row['pressure'],
+            'noise': row['noise'],
+            'battery_percent': row['battery_percent']
+        }
+        # Add wind/rain fields if they exist in the schema
+        try:
+            item['wind_strength'] = row['wind_strength']
+            item['wind_angle'] = row['wind_angle']
+            item['gust_strength'] = row['gust_strength']
+            item['gust_angle'] = row['gust_angle']
+            item['rain'] = row['rain']
+            item['rain_1h'] = row['rain_1h']
+            item['rain_24h'] = row['rain_24h']
+        except (IndexError, KeyError):
+            # Old schema without wind/rain columns
+            item['wind_strength'] = None
+            item['wind_angle'] = None
+            item['gust_strength'] = None
+            item['gust_angle'] = None
+            item['rain'] = None
+            item['rain_1h'] = None
+            item['rain_24h'] = None
+        return item
+
     def get_netatmo_data_last_24h(self, device_id):
         """
         Get Netatmo sensor data for the last 24 hours.
@@ -943,7 +1178,6 @@ class DeviceDatabase:
         ''')
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -976,7 +1210,6 @@ class DeviceDatabase:
 
         deleted = cursor.rowcount
         conn.commit()
-        conn.close()
 
         return deleted
 
@@ -994,18 +1227,18 @@ class DeviceDatabase:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # Get data closest to N hours ago (within 30 minutes)
+        # Get data closest to N hours ago (within 30 minutes).
+        # recorded_at is stored in isoformat, so bounds use the same 'T' separator.
         cursor.execute('''
             SELECT * FROM netatmo_timeseries
             WHERE device_id = ?
-            AND recorded_at BETWEEN datetime('now', 'localtime', '-{} hours', '-30 minutes')
-                                AND datetime('now', 'localtime', '-{} hours', '+30 minutes')
+            AND recorded_at BETWEEN strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime', '-{} hours', '-30 minutes')
+                                AND strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime', '-{} hours', '+30 minutes')
             ORDER BY ABS(julianday(recorded_at) - julianday(datetime('now', 'localtime', '-{} hours')))
             LIMIT 1
         '''.format(hours, hours, hours), (device_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return None
@@ -1065,7 +1298,6 @@ class DeviceDatabase:
         '''.format(hours), (device_id,))
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {'recorded_at': row['recorded_at'], 'pressure': row['pressure']}
@@ -1093,7 +1325,6 @@ class DeviceDatabase:
         ''', (device_id,))
 
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return None
@@ -1148,7 +1379,6 @@ class DeviceDatabase:
         ''', (device_id, skip))
 
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return None
@@ -1167,6 +1397,121 @@ class DeviceDatabase:
 
         return result
 
+    def get_netatmo_alert_snapshot(self):
+        """
+        Get everything the outdoor alert checks need for all Netatmo devices
+        in one connection (window queries instead of per-device lookups).
+
+        Returns:
+            dict: {device_id: {'latest': dict, 'previous': dict or None,
+                               'h6_ago': dict or None, 'yesterday': dict or None}}
+                  Rows include all netatmo_timeseries columns; devices are ordered
+                  by station and device name of the latest row.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        # Latest two rows per device: walk the distinct device_ids through the
+        # (device_id, recorded_at) index, then take LIMIT 2 per device from it,
+        # so the cost does not grow with the retained history
+        cursor.execute('''
+            WITH RECURSIVE devices(device_id) AS (
+                SELECT MIN(device_id) FROM netatmo_timeseries
+                UNION ALL
+                SELECT (SELECT MIN(device_id) FROM netatmo_timeseries
+                        WHERE device_id > devices.device_id)
+                FROM devices WHERE device_id IS NOT NULL
+            )
+            SELECT t.* FROM devices
+            JOIN netatmo_timeseries t ON t.rowid IN (
+                SELECT rowid FROM netatmo_timeseries
+                WHERE device_id = devices.device_id
+                ORDER BY recorded_at DESC
+                LIMIT 2
+            )
+        ''')
+        latest_rows = {}  # {device_id: [newest row, previous row]}
+        for row in cursor.fetchall():
+            latest_rows.setdefault(row['device_id'], []).append(row)
+
+        snapshot = {}
+        ordered = sorted(
+            (sorted(rows, key=lambda r: r['recorded_at'], reverse=True) for rows in latest_rows.values()),
+            key=lambda rows: (rows[0]['station_name'] or '', rows[0]['device_name'] or '')
+        )
+        for rows in ordered:
+            snapshot[rows[0]['device_id']] = {
+                'latest': self._netatmo_row_dict(rows[0]),
+                'previous': self._netatmo_row_dict(rows[1]) if len(rows) > 1 else None,
+                'h6_ago': None,
+                'yesterday': None
+            }
+
+        # Row closest to N hours ago per device (within 30 minutes).
+        # recorded_at is stored in isoformat, so bounds use the same 'T' separator.
+        for key, hours in (('h6_ago', 6), ('yesterday', 24)):
+            cursor.execute('''
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY device_id
+                        ORDER BY ABS(julianday(recorded_at) - julianday(datetime('now', 'localtime', '-{0} hours')))
+                    ) AS rn
+                    FROM netatmo_timeseries
+                    WHERE recorded_at BETWEEN strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime', '-{0} hours', '-30 minutes')
+                                          AND strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime', '-{0} hours', '+30 minutes')
+                )
+                WHERE rn = 1
+            '''.format(int(hours)))
+            for row in cursor.fetchall():
+                entry = snapshot.get(row['device_id'])
+                if entry is not None:
+                    entry[key] = self._netatmo_row_dict(row)
+
+        return snapshot
+
+    @staticmethod
+    def _netatmo_row_dict(row):
+        """Convert a netatmo_timeseries row (optionally with rn) to a dict."""
+        result = {key: row[key] for key in row.keys() if key not in ('id', 'rn')}
+        result['is_outdoor'] = bool(result.get('is_outdoor'))
+        return result
+
+    # ========== Alert Cooldown Methods ==========
+
+    def get_alert_cooldowns(self):
+        """
+        Get last alert times for all alert types and devices.
+
+        Returns:
+            dict: {(alert_type, device_id): last_alert_at (Unix time)}
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT alert_type, device_id, last_alert_at FROM alert_cooldowns')
+        rows = cursor.fetchall()
+
+        return {(row['alert_type'], row['device_id']): row['last_alert_at'] for row in rows}
+
+    def set_alert_cooldown(self, alert_type, device_id, last_alert_at):
+        """
+        Record the time an alert was sent.
+
+        Args:
+            alert_type: Alert type ('rain', 'wind', 'temperature', 'pressure')
+            device_id: Device ID
+            last_alert_at: Unix time the alert was sent
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO alert_cooldowns (alert_type, device_id, last_alert_at)
+            VALUES (?, ?, ?)
+        ''', (alert_type, device_id, last_alert_at))
+
+        conn.commit()
+
 
 if __name__ == '__main__':
     # Simple test
@@ -14,6 +14,9 @@ from datetime import datetime
 
 import requests
 
+import json_utils
+from network_resilience import create_http_session
+
 
 class GoogleNestAPI:
     """Google Nest SDM API client with OAuth2 authentication."""
@@ -37,7 +40,8 @@ class GoogleNestAPI:
         'sdm.devices.traits.CameraSound': 'sound',
     }
 
-    def __init__(self, project_id, client_id, client_secret, refresh_token, credentials_file=None):
+    def __init__(self, project_id, client_id, client_secret, refresh_token, credentials_file=None,
+                 session=None):
         """
         Initialize Google Nest API client.
 
@@ -47,6 +51,7 @@ class GoogleNestAPI:
             client_secret: Google Cloud OAuth2 client secret
             refresh_token: OAuth2 refresh token
             credentials_file: Optional file path to persist updated refresh token
+            session: Optional shared requests.Session
         """
         self.project_id = project_id
         self.client_id = client_id
@@ -62,6 +67,16 @@ class GoogleNestAPI:
         # Cache for last event timestamps (to avoid duplicate notifications)
         self._last_event_times = {}
 
+        # Persistent keep-alive session for token refresh and API calls
+        # (shared with the other clients when passed in)
+        self.session = session or create_http_session()
+        self._owns_session = session is None
+
+    def close(self):
+        """Close the underlying HTTP session (unless it is shared)."""
+        if self._owns_session:
+            self.session.close()
+
     def _refresh_access_token(self):
         """
         Refresh the access token using the refresh token.
@@ -75,7 +90,7 @@ class GoogleNestAPI:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.TOKEN_URL,
                 data=payload,
                 timeout=30
@@ -116,8 +131,7 @@ class GoogleNestAPI:
                 'client_secret': self.client_secret,
                 'refresh_token': self.refresh_token
             }
-            with open(self.credentials_file, 'w') as f:
-                json.dump(credentials, f, indent=2)
+            json_utils.dump_file_atomic(credentials, self.credentials_file)
             logging.debug("Google Nest credentials saved to %s", self.credentials_file)
         except Exception as e:
             logging.warning("Failed to save Google Nest credentials: %s", e)
@@ -151,14 +165,14 @@ class GoogleNestAPI:
 
         try:
             if method.upper() == 'GET':
-                response = requests.get(
+                response = self.session.get(
                     url,
                     headers=headers,
                     params=params,
                     timeout=30
                 )
             elif method.upper() == 'POST':
-                response = requests.post(
+                response = self.session.post(
                     url,
                     headers=headers,
                     json=data,
@@ -320,7 +334,7 @@ class GoogleNestAPI:
         }
 
         try:
-            response = requests.get(image_url, headers=headers, timeout=30)
+            response = self.session.get(image_url, headers=headers, timeout=30)
             response.raise_for_status()
 
             if output_path:
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+JSON helpers.
+Uses orjson when installed (optional), otherwise the standard library.
+"""
+import json
+import os
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data):
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text (str or UTF-8 bytes)
+
+    Returns:
+        Parsed object
+
+    Raises:
+        json.JSONDecodeError: On invalid JSON (orjson's error is a subclass)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """
+    Serialize an object to compact JSON.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        bytes: UTF-8 encoded JSON (no whitespace between separators)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dump_file_atomic(obj, path):
+    """
+    Write an object as indented JSON, replacing the file atomically.
+
+    The data is written and fsynced to a temporary file next to the target,
+    then renamed over it, so a crash never leaves a truncated file behind.
+    An existing file's permissions are kept (credentials files are often 0600).
+
+    Args:
+        obj: JSON-serializable object
+        path: Destination file path
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(path):
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+    os.replace(tmp_path, path)
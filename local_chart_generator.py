@@ -24,8 +24,12 @@ Usage:
 import logging
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# RAM-backed tmpfs; keeps chart PNGs off the Raspberry Pi's SD card
+TMPFS_DIR = '/dev/shm'
+
 try:
     import matplotlib
     matplotlib.use('Agg')  # Non-GUI backend for headless systems (Raspberry Pi)
@@ -84,79 +88,16 @@ except ImportError:
     MATPLOTLIB_AVAILABLE = False
     logging.warning("matplotlib not available. Install with: pip install matplotlib==3.5.3")
 
-import requests
-
-
-def downsample_sensor_data(sensor_data, interval_seconds):
-    """
-    Downsample sensor data by averaging values within each interval.
-    (Same as chart_generator.py for compatibility)
-    """
-    if not sensor_data or interval_seconds <= 0:
-        return sensor_data
-
-    grouped = {}
-    first_dt = None
-
-    for reading in sensor_data:
-        timestamp = reading['recorded_at']
-        try:
-            if 'T' in timestamp:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                dt = dt.replace(tzinfo=None)
-            else:
-                dt = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
-
-            if first_dt is None:
-                first_dt = dt
+from network_resilience import create_http_session
 
-            seconds_since_start = int((dt - first_dt).total_seconds())
-            interval_key = (seconds_since_start // interval_seconds) * interval_seconds
+# Same downsampling as the QuickChart generator (NumPy-accelerated when available)
+from chart_generator import downsample_sensor_data
 
-            if interval_key not in grouped:
-                grouped[interval_key] = []
-            grouped[interval_key].append(reading)
-        except (ValueError, AttributeError):
-            continue
+# Concurrent chart file transfers to Slack (sharing to the channel stays in order)
+SLACK_UPLOAD_WORKERS = 4
 
-    result = []
-    for interval_key in sorted(grouped.keys()):
-        readings = grouped[interval_key]
-        if not readings:
-            continue
-
-        representative_timestamp = readings[0]['recorded_at']
-
-        temps = [r['temperature'] for r in readings if r.get('temperature') is not None]
-        humids = [r['humidity'] for r in readings if r.get('humidity') is not None]
-        co2s = [r['co2'] for r in readings if r.get('co2') is not None]
-        pressures = [r['pressure'] for r in readings if r.get('pressure') is not None]
-        noises = [r['noise'] for r in readings if r.get('noise') is not None]
-        winds = [r['wind_strength'] for r in readings if r.get('wind_strength') is not None]
-        gusts = [r['gust_strength'] for r in readings if r.get('gust_strength') is not None]
-        wind_angles = [r['wind_angle'] for r in readings if r.get('wind_angle') is not None]
-        rains = [r['rain'] for r in readings if r.get('rain') is not None]
-        rains_1h = [r['rain_1h'] for r in readings if r.get('rain_1h') is not None]
-        rains_24h = [r['rain_24h'] for r in readings if r.get('rain_24h') is not None]
-        light_levels = [r['light_level'] for r in readings if r.get('light_level') is not None]
-
-        result.append({
-            'recorded_at': representative_timestamp,
-            'temperature': round(sum(temps) / len(temps), 1) if temps else None,
-            'humidity': round(sum(humids) / len(humids)) if humids else None,
-            'co2': round(sum(co2s) / len(co2s)) if co2s else None,
-            'pressure': round(sum(pressures) / len(pressures), 1) if pressures else None,
-            'noise': round(sum(noises) / len(noises)) if noises else None,
-            'wind_strength': round(sum(winds) / len(winds)) if winds else None,
-            'gust_strength': round(sum(gusts) / len(gusts)) if gusts else None,
-            'wind_angle': round(sum(wind_angles) / len(wind_angles)) if wind_angles else None,
-            'rain': round(sum(rains) / len(rains), 1) if rains else None,
-            'rain_1h': round(sum(rains_1h) / len(rains_1h), 1) if rains_1h else None,
-            'rain_24h': round(sum(rains_24h) / len(rains_24h), 1) if rains_24h else None,
-            'light_level': round(sum(light_levels) / len(light_levels)) if light_levels else None,
-        })
-
-    return result
+# Slack shows at most 10 files attached to a single message
+SLACK_FILES_PER_MESSAGE = 10
 
 
 def filter_data_by_hours(sensor_data, hours):
@@ -252,16 +193,24 @@ class LocalChartGenerator:
         Args:
             width: Chart width in pixels
             height: Chart height in pixels
-            output_dir: Directory to save chart images (default: temp directory)
+            output_dir: Directory to save chart images
+                        (default: /dev/shm if available, else the temp directory)
         """
         self.width = width
         self.height = height
-        self.output_dir = output_dir or tempfile.gettempdir()
+        self.output_dir = output_dir or self._default_output_dir()
         self.dpi = 100
 
         if not MATPLOTLIB_AVAILABLE:
             raise ImportError("matplotlib is required. Install with: pip install matplotlib==3.5.3")
 
+    @staticmethod
+    def _default_output_dir():
+        """Prefer tmpfs so charts are written to RAM rather than the SD card."""
+        if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK):
+            return TMPFS_DIR
+        return tempfile.gettempdir()
+
     def _parse_time(self, timestamp):
         """Parse timestamp and return datetime object."""
         try:
@@ -820,19 +769,70 @@ class LocalChartGenerator:
         return filepath
 
 
+# Per-process generator reused by render_chart in pool workers
+_worker_generator = None
+
+
+def render_chart(kind, devices_data, metric, date_str, interval_seconds=None,
+                 hours_range=None, chart_type=None):
+    """
+    Render one chart in a process pool worker.
+
+    Module-level and called with plain arguments so it pickles under the
+    spawn/forkserver start methods.
+
+    Args:
+        kind: 'multi', 'wind', 'wind_direction' or 'rain'
+        devices_data: Dict of {device_name: sensor_data_list}
+        metric: Metric for 'multi' charts (ignored for the others)
+        date_str: Date string for the chart title
+        interval_seconds: Interval for downsampling
+        hours_range: Hours shown on the X axis (12 or 24)
+        chart_type: Chart category for 'multi' charts
+
+    Returns:
+        str: Path to the generated image
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = LocalChartGenerator()
+    generator = _worker_generator
+
+    if kind == 'multi':
+        return generator.generate_multi_device_chart(
+            devices_data, metric, date_str,
+            interval_seconds=interval_seconds, hours_range=hours_range, chart_type=chart_type
+        )
+    if kind == 'wind':
+        return generator.generate_wind_chart(
+            devices_data, date_str, interval_seconds=interval_seconds, hours_range=hours_range
+        )
+    if kind == 'wind_direction':
+        return generator.generate_wind_direction_chart(
+            devices_data, date_str, interval_seconds=interval_seconds, hours_range=hours_range
+        )
+    if kind == 'rain':
+        return generator.generate_rain_chart(
+            devices_data, date_str, interval_seconds=interval_seconds, hours_range=hours_range
+        )
+    raise ValueError("Unknown chart kind: %s" % kind)
+
+
 class SlackImageUploader:
     """Upload images to Slack using the new API (files.getUploadURLExternal)."""
 
-    def __init__(self, bot_token, channel_id):
+    def __init__(self, bot_token, channel_id, session=None):
         """
         Initialize Slack uploader.
 
         Args:
             bot_token: Slack Bot OAuth Token
             channel_id: Target Slack channel ID
+            session: Optional shared requests.Session (keep-alive)
         """
         self.bot_token = bot_token
         self.channel_id = channel_id
+        self.session = session or create_http_session()
 
     def upload_file(self, file_path, title, initial_comment=''):
         """
@@ -840,7 +840,7 @@ class SlackImageUploader:
 
         Uses the three-step upload process:
         1. files.getUploadURLExternal - get upload URL
-        2. POST file to the upload URL
+        2. POST file bytes to the upload URL (streamed from disk)
         3. files.completeUploadExternal - complete upload and share to channel
 
         Args:
@@ -851,17 +851,30 @@ class SlackImageUploader:
         Returns:
             bool: True if successful, False otherwise
         """
+        file_id = self._upload_file_data(file_path)
+        if not file_id:
+            return False
+        return self._complete_upload([(file_id, title)], initial_comment)
+
+    def _upload_file_data(self, file_path):
+        """
+        Steps 1-2 of upload_file: get an upload URL and send the file bytes.
+        Safe to run concurrently for different files.
+
+        Returns:
+            str or None: Slack file ID, or None on failure
+        """
         if not self.bot_token:
             logging.error("SLACK_BOT_TOKEN is not set")
-            return False
+            return None
 
         if not self.channel_id:
             logging.error("SLACK_CHANNEL_ID is not set")
-            return False
+            return None
 
         if not os.path.exists(file_path):
             logging.error("File not found: %s", file_path)
-            return False
+            return None
 
         headers = {
             'Authorization': 'Bearer {}'.format(self.bot_token)
@@ -872,7 +885,7 @@ class SlackImageUploader:
 
         # Step 1: Get upload URL
         try:
-            response = requests.post(
+            response = self.session.post(
                 'https://slack.com/api/files.getUploadURLExternal',
                 headers=headers,
                 data={
@@ -885,42 +898,55 @@ class SlackImageUploader:
 
             if not result.get('ok'):
                 logging.error("files.getUploadURLExternal failed: %s", result.get('error'))
-                return False
+                return None
 
             upload_url = result['upload_url']
             file_id = result['file_id']
 
         except Exception as e:
             logging.error("Failed to get upload URL: %s", e)
-            return False
+            return None
 
-        # Step 2: Upload file
+        # Step 2: Upload file as a raw body (streamed, no multipart encoding in memory)
         try:
             with open(file_path, 'rb') as f:
-                response = requests.post(
+                response = self.session.post(
                     upload_url,
-                    files={'file': (filename, f)},
+                    data=f,
+                    headers={'Content-Type': 'application/octet-stream'},
                     timeout=60
                 )
 
             if response.status_code != 200:
                 logging.error("File upload failed: %s", response.status_code)
-                return False
+                return None
 
         except Exception as e:
             logging.error("File upload failed: %s", e)
-            return False
+            return None
+
+        return file_id
+
+    def _complete_upload(self, files, initial_comment=''):
+        """
+        Step 3 of upload_file: complete the upload and share it to the channel.
+
+        Args:
+            files: List of (file_id, title) tuples, shared together in one message
+            initial_comment: Optional message text posted with the files
 
-        # Step 3: Complete upload and share to channel
+        Returns:
+            bool: True if successful, False otherwise
+        """
         try:
-            response = requests.post(
+            response = self.session.post(
                 'https://slack.com/api/files.completeUploadExternal',
                 headers={
                     'Authorization': 'Bearer {}'.format(self.bot_token),
                     'Content-Type': 'application/json'
                 },
                 json={
-                    'files': [{'id': file_id, 'title': title}],
+                    'files': [{'id': file_id, 'title': title} for file_id, title in files],
                     'channel_id': self.channel_id,
                     'initial_comment': initial_comment
                 },
@@ -932,7 +958,7 @@ class SlackImageUploader:
                 logging.error("files.completeUploadExternal failed: %s", result.get('error'))
                 return False
 
-            logging.info("Slack upload successful: file_id=%s", file_id)
+            logging.info("Slack upload successful: %d file(s)", len(files))
             return True
 
         except Exception as e:
@@ -953,7 +979,7 @@ class SlackImageUploader:
             return False
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 'https://slack.com/api/chat.postMessage',
                 headers={
                     'Authorization': 'Bearer {}'.format(self.bot_token),
@@ -971,9 +997,96 @@ class SlackImageUploader:
             logging.error("Failed to post message: %s", e)
             return False
 
+    CHART_TITLES = {
+        'outdoor_temp': '🌳 屋外 温度',
+        'outdoor_humidity': '🌳 屋外 湿度',
+        'indoor_temp': '🏠 屋内 温度',
+        'indoor_humidity': '🏠 屋内 湿度',
+        'co2': '🏠 CO2濃度',
+        'pressure': '🏠 気圧',
+        'noise': '🏠 騒音',
+        'wind': '🌬️ 風速・突風',
+        'wind_direction': '🧭 風向',
+        'rain': '🌧️ 雨量',
+        'light_level': '💡 照度',
+    }
+
+    # Order: 12h charts first, then 24h charts (grouped by metric type)
+    CHART_ORDER = (
+        # 12h charts
+        'outdoor_temp_12h', 'outdoor_humidity_12h',
+        'indoor_temp_12h', 'indoor_humidity_12h', 'co2_12h',
+        'pressure_12h', 'noise_12h',
+        'wind_12h', 'wind_direction_12h',
+        'rain_12h', 'light_level_12h',
+        # 24h charts
+        'outdoor_temp_24h', 'outdoor_humidity_24h',
+        'indoor_temp_24h', 'indoor_humidity_24h', 'co2_24h',
+        'pressure_24h', 'noise_24h',
+        'wind_24h', 'wind_direction_24h',
+        'rain_24h', 'light_level_24h',
+        # Legacy keys (without time suffix)
+        'outdoor_temp', 'outdoor_humidity',
+        'indoor_temp', 'indoor_humidity', 'co2',
+        'pressure', 'noise',
+        'wind', 'wind_direction',
+        'rain', 'light_level'
+    )
+
+    def _chart_title(self, chart_key):
+        """Title for a chart key such as 'outdoor_temp' or 'outdoor_temp_12h'."""
+        if chart_key.endswith('_12h'):
+            base_type = chart_key[:-4]
+            time_suffix = ' (直近12h)'
+        elif chart_key.endswith('_24h'):
+            base_type = chart_key[:-4]
+            time_suffix = ' (直近24h)'
+        else:
+            base_type = chart_key
+            time_suffix = ''
+
+        return self.CHART_TITLES.get(base_type, base_type) + time_suffix
+
+    def _upload_chart_files(self, chart_paths):
+        """
+        Send chart file bytes concurrently (the slow part).
+
+        Returns:
+            list: [(chart_key, file_id_or_None)] in chart order
+        """
+        ordered_keys = [key for key in self.CHART_ORDER if chart_paths.get(key)]
+        if not ordered_keys:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(SLACK_UPLOAD_WORKERS, len(ordered_keys))) as executor:
+            file_id_futures = [
+                executor.submit(self._upload_file_data, chart_paths[key])
+                for key in ordered_keys
+            ]
+
+        uploaded = []
+        for chart_key, file_id_future in zip(ordered_keys, file_id_futures):
+            try:
+                file_id = file_id_future.result()
+            except Exception as e:
+                logging.error("File upload failed: %s", e)
+                file_id = None
+            uploaded.append((chart_key, file_id))
+        return uploaded
+
+    @staticmethod
+    def _remove_uploaded(chart_paths, results):
+        """Clean up temporary files of successfully shared charts."""
+        for chart_key, success in results.items():
+            if success:
+                try:
+                    os.remove(chart_paths[chart_key])
+                except Exception:
+                    pass
+
     def upload_charts(self, chart_paths, date_str):
         """
-        Upload multiple chart images to Slack.
+        Upload multiple chart images to Slack, one message per chart.
         Supports both regular keys (e.g., 'outdoor_temp') and time-suffixed keys (e.g., 'outdoor_temp_12h').
 
         Args:
@@ -983,74 +1096,57 @@ class SlackImageUploader:
         Returns:
             dict: {chart_type: success_bool}
         """
-        chart_titles = {
-            'outdoor_temp': '🌳 屋外 温度',
-            'outdoor_humidity': '🌳 屋外 湿度',
-            'indoor_temp': '🏠 屋内 温度',
-            'indoor_humidity': '🏠 屋内 湿度',
-            'co2': '🏠 CO2濃度',
-            'pressure': '🏠 気圧',
-            'noise': '🏠 騒音',
-            'wind': '🌬️ 風速・突風',
-            'wind_direction': '🧭 風向',
-            'rain': '🌧️ 雨量',
-            'light_level': '💡 照度',
-        }
-
-        # Order: 12h charts first, then 24h charts (grouped by metric type)
-        chart_order = [
-            # 12h charts
-            'outdoor_temp_12h', 'outdoor_humidity_12h',
-            'indoor_temp_12h', 'indoor_humidity_12h', 'co2_12h',
-            'pressure_12h', 'noise_12h',
-            'wind_12h', 'wind_direction_12h',
-            'rain_12h', 'light_level_12h',
-            # 24h charts
-            'outdoor_temp_24h', 'outdoor_humidity_24h',
-            'indoor_temp_24h', 'indoor_humidity_24h', 'co2_24h',
-            'pressure_24h', 'noise_24h',
-            'wind_24h', 'wind_direction_24h',
-            'rain_24h', 'light_level_24h',
-            # Legacy keys (without time suffix)
-            'outdoor_temp', 'outdoor_humidity',
-            'indoor_temp', 'indoor_humidity', 'co2',
-            'pressure', 'noise',
-            'wind', 'wind_direction',
-            'rain', 'light_level'
-        ]
-
         results = {}
 
-        for chart_key in chart_order:
-            if chart_key not in chart_paths or not chart_paths[chart_key]:
-                continue
+        # Share in chart order once all file bytes are sent
+        for chart_key, file_id in self._upload_chart_files(chart_paths):
+            title = self._chart_title(chart_key)
+            results[chart_key] = bool(file_id) and self._complete_upload([(file_id, title)], title)
 
-            file_path = chart_paths[chart_key]
+        self._remove_uploaded(chart_paths, results)
+        return results
 
-            # Extract base chart type and time suffix
-            if chart_key.endswith('_12h'):
-                base_type = chart_key[:-4]
-                time_suffix = ' (直近12h)'
-            elif chart_key.endswith('_24h'):
-                base_type = chart_key[:-4]
-                time_suffix = ' (直近24h)'
-            else:
-                base_type = chart_key
-                time_suffix = ''
+    def upload_charts_with_summary(self, chart_paths, summary_text, date_str):
+        """
+        Upload chart images and share them together with the summary text.
 
-            title = chart_titles.get(base_type, base_type) + time_suffix
-            comment = '{}'.format(title)
+        Files are shared with files.completeUploadExternal in batches of
+        SLACK_FILES_PER_MESSAGE, and the summary rides along as the first
+        batch's initial_comment instead of a separate chat.postMessage.
 
-            success = self.upload_file(file_path, title, comment)
-            results[chart_key] = success
+        Args:
+            chart_paths: Dict of {chart_type: file_path} or {chart_type_Nh: file_path}
+            summary_text: Summary message text (may be None)
+            date_str: Date string for comments
 
+        Returns:
+            dict: {chart_type: success_bool}
+        """
+        results = {}
+        shareable = []
+        for chart_key, file_id in self._upload_chart_files(chart_paths):
+            if file_id:
+                shareable.append((chart_key, file_id))
+            else:
+                results[chart_key] = False
+
+        comment = summary_text or ''
+        for start in range(0, len(shareable), SLACK_FILES_PER_MESSAGE):
+            batch = shareable[start:start + SLACK_FILES_PER_MESSAGE]
+            success = self._complete_upload(
+                [(file_id, self._chart_title(chart_key)) for chart_key, file_id in batch],
+                comment
+            )
             if success:
-                # Clean up temporary file
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    pass
+                comment = ''
+            for chart_key, _ in batch:
+                results[chart_key] = success
+
+        # Nothing was shared, so the summary still needs its own message
+        if comment:
+            self.post_message(comment)
 
+        self._remove_uploaded(chart_paths, results)
         return results
 
 
@@ -6,44 +6,141 @@ Monitors SwitchBot devices via polling and webhooks, sends Slack notifications.
 
 Python 3.7+ compatible, requires only requests library.
 """
+import functools
+import hashlib
+import heapq
 import json
 import os
+import queue
+import re
 import sys
 import time
 import signal
 import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
+from types import SimpleNamespace
 
+import json_utils
 from switchbot_api import SwitchBotAPI
 from netatmo_api import NetatmoAPI
 from google_nest_api import GoogleNestAPI
 from google_nest_pubsub import GoogleNestPubSubClient
 from database import DeviceDatabase
-from slack_notifier import SlackNotifier
+from slack_notifier import SlackNotifier, SensorLatest
 from webhook_server import WebhookServer, parse_webhook_event
 from cloudflare_tunnel import CloudflareTunnel
 from chart_generator import ChartGenerator
 from garbage_notifier import GarbageNotifier
 from dashboard_server import DashboardServer
-from network_resilience import NetworkHealthChecker
+from network_resilience import NetworkHealthChecker, create_http_session
 
 # Optional: Local chart generator for Raspberry Pi (requires matplotlib)
 try:
-    from local_chart_generator import LocalChartGenerator, SlackImageUploader
+    from local_chart_generator import LocalChartGenerator, SlackImageUploader, render_chart
     LOCAL_CHART_AVAILABLE = True
 except ImportError:
     LOCAL_CHART_AVAILABLE = False
 
 
-# Global flag for graceful shutdown
-running = True
+# Set on shutdown signal; wakes the main loop immediately
+stop_event = threading.Event()
+
+# Garbage notification check interval (notification window is 5 minutes)
+GARBAGE_CHECK_INTERVAL_SECONDS = 60
+
+# Old history/time series rows are deleted periodically (not on shutdown)
+DATABASE_CLEANUP_INTERVAL_SECONDS = 3600
+
+# Maximum concurrent SwitchBot status requests per polling cycle
+MAX_POLL_WORKERS = 8
+
+# QuickChart short-URL requests made concurrently per graph report
+MAX_CHART_URL_WORKERS = 5
+# Deadline for the whole batch; charts still pending are left out of the report
+CHART_URL_TIMEOUT_SECONDS = 30
+
+# Pending webhook events handled by the event worker (excess events get HTTP 503)
+WEBHOOK_QUEUE_SIZE = 1024
+
+# Consecutive Netatmo samples a rain/wind condition must hold before alerting
+ALERT_CONFIRM_SAMPLES = 2
+
+# Wind alert levels (km/h, based on Japan Meteorological Agency):
+# (enter threshold, exit threshold, level, message); exit < enter avoids flapping
+# 10m/s = 36km/h: やや強い風 (傘がさせない)
+# 15m/s = 54km/h: 強い風 (風に向かって歩けない)
+# 20m/s = 72km/h: 非常に強い風 (立っていられない)
+WIND_ALERT_LEVELS = (
+    (36, 30, 'info', "やや強い風です。傘がさしにくくなります"),
+    (54, 48, 'warning', "強い風です。風に向かって歩きにくくなります"),
+    (72, 66, 'danger', "非常に強い風（暴風）です"),
+)
+
+# Netatmo reports wind in km/h; the summary shows m/s
+KMH_TO_MS = 1 / 3.6
+
+# Pressure change alert levels over 6 hours (hPa):
+# (threshold, level, message when falling, message when rising); checked in order
+PRESSURE_ALERT_LEVELS = (
+    (10, 'danger', "気圧が急激に低下しています（気象病警戒）", "気圧が急激に上昇しています（気象病警戒）"),
+    (6, 'warning', "気圧が下がっています。頭痛に注意", "気圧が上がっています。頭痛に注意"),
+    (4, 'info', "気圧が低下傾向です", "気圧が上昇傾向です"),
+)
+
+# Temperature change vs yesterday same time (°C): alert / warning level
+TEMPERATURE_ALERT_DIFF = 2.0
+TEMPERATURE_WARNING_DIFF = 5.0
+
+# Identical webhook events for a device within this window are dropped as duplicates
+WEBHOOK_DEBOUNCE_SECONDS = 2.0
+WEBHOOK_DEBOUNCE_MAX_DEVICES = 256
+
+# Recently seen webhook event keys (replayed deliveries of the same event are dropped)
+WEBHOOK_SEEN_EVENTS_SIZE = 4096
+
+# Netatmo reading fields written to the polling log: (key, format)
+NETATMO_LOG_FIELDS = (
+    ('temperature', 'temp={:.1f}'),
+    ('humidity', 'humidity={}'),
+    ('co2', 'CO2={}'),
+    ('pressure', 'pressure={:.1f}'),
+    ('noise', 'noise={}'),
+    ('wind_strength', 'wind={}km/h'),
+    ('gust_strength', 'gust={}km/h'),
+    ('wind_angle', 'dir={}°'),
+    ('rain', 'rain={}mm'),
+    ('rain_1h', 'rain1h={}mm'),
+    ('rain_24h', 'rain24h={}mm'),
+)
+
+# Reading fields shown per device in the Slack sensor summary: (key, format)
+SUMMARY_FIELDS = (
+    ('temperature', '{}°C'),
+    ('humidity', '{}%'),
+    ('co2', '{}ppm'),
+    ('pressure', '{}hPa'),
+    ('noise', '{}dB'),
+)
+
+# SwitchBot device types that record sensor time series data
+SENSOR_DEVICE_TYPES = frozenset([
+    'Meter', 'MeterPlus', 'MeterPro', 'MeterPro(CO2)',
+    'WoIOSensor', 'Hub 2', 'Hub 3', 'Outdoor Meter'
+])
+
+# Device name keywords that mark an outdoor sensor
+OUTDOOR_KEYWORDS = ('防水温湿度計', '屋外', 'Outdoor')
+OUTDOOR_RE = re.compile('|'.join(map(re.escape, OUTDOOR_KEYWORDS)))
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    global running
     logging.info("Received signal %s, shutting down...", signum)
-    running = False
+    stop_event.set()
 
 
 def setup_logging(log_level='INFO', log_file=None):
@@ -73,8 +170,8 @@ def load_config(config_path):
         logging.error("Please copy config.json.example to config.json and configure it")
         sys.exit(1)
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(config_path, 'rb') as f:
+        return json_utils.loads(f.read())
 
 
 def matches_filter(device_name, filter_list):
@@ -88,10 +185,28 @@ def matches_filter(device_name, filter_list):
     Returns:
         bool: True if matches any filter
     """
-    for pattern in filter_list:
-        if pattern in device_name:
-            return True
-    return False
+    return any(pattern in device_name for pattern in filter_list)
+
+
+def compile_filter(filter_list):
+    """
+    Compile filter patterns into a single regex (partial match on any pattern).
+
+    Args:
+        filter_list: List of filter patterns (partial match)
+
+    Returns:
+        re.Pattern or None: Compiled pattern, or None if filter_list is empty
+    """
+    if not filter_list:
+        return None
+    return re.compile('|'.join(map(re.escape, filter_list)))
+
+
+@functools.lru_cache(maxsize=256)
+def is_outdoor_sensor(device_name):
+    """Check if device is an outdoor sensor (by name keyword, cached per name)."""
+    return OUTDOOR_RE.search(device_name) is not None
 
 
 def build_device_map(api, config):
@@ -109,8 +224,8 @@ def build_device_map(api, config):
     devices_data = api.get_devices()
     device_list = devices_data.get('deviceList', [])
 
-    ignore_patterns = config.get('monitor', {}).get('ignore_devices', [])
-    polling_patterns = config.get('monitor', {}).get('polling_devices', [])
+    ignore_re = compile_filter(config.get('monitor', {}).get('ignore_devices', []))
+    polling_re = compile_filter(config.get('monitor', {}).get('polling_devices', []))
     type_overrides = config.get('monitor', {}).get('device_type_overrides', {})
 
     device_map = {}
@@ -125,9 +240,9 @@ def build_device_map(api, config):
             device_type = type_overrides[device_name]
 
         # Determine category
-        if matches_filter(device_name, ignore_patterns):
+        if ignore_re and ignore_re.search(device_name):
             category = 'ignore'
-        elif matches_filter(device_name, polling_patterns):
+        elif polling_re and polling_re.search(device_name):
             category = 'polling'
         else:
             category = 'webhook'
@@ -136,7 +251,10 @@ def build_device_map(api, config):
             'device_id': device_id,
             'device_name': device_name,
             'device_type': device_type,
-            'category': category
+            'category': category,
+            # Static report metadata (used by send_graph_report)
+            'display_name': "[SB] " + device_name,
+            'is_outdoor': is_outdoor_sensor(device_name)
         }
 
         logging.info("Device: %s (%s) -> %s", device_name, device_type, category)
@@ -144,6 +262,36 @@ def build_device_map(api, config):
     return device_map
 
 
+def normalize_mac(mac):
+    """Normalize a MAC address / device ID for lookup (no separators, uppercase)."""
+    return mac.replace(':', '').replace('-', '').upper()
+
+
+def build_mac_index(device_map):
+    """
+    Build webhook MAC lookup table from the device map.
+
+    Args:
+        device_map: Device map from build_device_map()
+
+    Returns:
+        dict: {device_id or normalized MAC: device info}
+    """
+    mac_index = {}
+
+    for dev_id, info in device_map.items():
+        if not dev_id:
+            continue
+        normalized = normalize_mac(dev_id)
+        mac_index[dev_id] = info
+        mac_index[normalized] = info
+        # Device IDs may carry a prefix before the 12-digit MAC
+        if len(normalized) > 12:
+            mac_index.setdefault(normalized[-12:], info)
+
+    return mac_index
+
+
 class SwitchBotMonitor:
     """Main monitor class integrating all components."""
 
@@ -151,14 +299,55 @@ class SwitchBotMonitor:
         """Initialize monitor with configuration."""
         self.config = config
 
+        # Config values used in the main loop, resolved once
+        monitor_config = config.get('monitor', {})
+        graph_config = config.get('graph_report', {})
+        database_config = config.get('database', {})
+        slack_config = config.get('slack', {})
+        interval_seconds = monitor_config.get('interval_seconds', 1800)
+        self.monitor_cfg = SimpleNamespace(
+            interval_seconds=interval_seconds,
+            # Upper bound for per-device back-off (== interval_seconds disables it)
+            max_interval_seconds=max(
+                interval_seconds, monitor_config.get('max_interval_seconds', interval_seconds)
+            )
+        )
+        self.graph_cfg = SimpleNamespace(
+            enabled=graph_config.get('enabled', False),
+            interval_seconds=graph_config.get('interval_minutes', 5) * 60,
+            downsample_seconds=graph_config.get('downsample_seconds', 600)
+        )
+        self.netatmo_cfg = SimpleNamespace(
+            interval_seconds=config.get('netatmo', {}).get('interval_seconds', 600)
+        )
+        self.nest_cfg = SimpleNamespace(
+            interval_seconds=config.get('google_nest', {}).get('interval_seconds', 300),
+            poll_timeout_seconds=config.get('google_nest', {}).get('pubsub', {}).get('poll_timeout_seconds', 60)
+        )
+        self.database_cfg = SimpleNamespace(
+            history_days=database_config.get('history_days', 30),
+            sensor_data_days=database_config.get('sensor_data_days', 7),
+            netatmo_data_days=database_config.get('netatmo_data_days', 7)
+        )
+        self.slack_cfg = SimpleNamespace(
+            notify_errors=slack_config.get('notify_errors', False),
+            notify_startup=slack_config.get('notify_startup', True),
+            outdoor_alert_channel=slack_config.get('channels', {}).get('outdoor_alert')
+        )
+
         # Initialize network health checker
         self.network_checker = NetworkHealthChecker()
 
+        # One keep-alive pool shared by every cloud API client
+        # (sized for concurrent SwitchBot status polls)
+        self.http_session = create_http_session(pool_maxsize=MAX_POLL_WORKERS * 2)
+
         # Initialize SwitchBot API
         switchbot_config = config['switchbot']
         self.api = SwitchBotAPI(
             token=switchbot_config['token'],
-            secret=switchbot_config['secret']
+            secret=switchbot_config['secret'],
+            session=self.http_session
         )
 
         # Initialize Netatmo API (optional)
@@ -171,8 +360,10 @@ class SwitchBotMonitor:
                     client_secret=netatmo_config['client_secret'],
                     refresh_token=netatmo_config['refresh_token'],
                     credentials_file=netatmo_config.get('credentials_file'),
-                    network_checker=self.network_checker
+                    network_checker=self.network_checker,
+                    session=self.http_session
                 )
+                self.netatmo_api.start_refresher()
                 logging.info("Netatmo API initialized")
             except Exception as e:
                 logging.error("Failed to initialize Netatmo API: %s", e)
@@ -189,7 +380,8 @@ class SwitchBotMonitor:
                     client_id=nest_config['client_id'],
                     client_secret=nest_config['client_secret'],
                     refresh_token=nest_config['refresh_token'],
-                    credentials_file=nest_config.get('credentials_file')
+                    credentials_file=nest_config.get('credentials_file'),
+                    session=self.http_session
                 )
                 logging.info("Google Nest API initialized")
 
@@ -213,29 +405,44 @@ class SwitchBotMonitor:
                 logging.error("Failed to initialize Google Nest API: %s", e)
 
         # Initialize database
-        db_path = config.get('database', {}).get('path', 'device_states.db')
+        db_path = database_config.get('path', 'device_states.db')
         self.db = DeviceDatabase(db_path)
 
         # Initialize Slack with new multi-channel config
-        slack_config = config.get('slack', {})
-        self.slack = SlackNotifier(slack_config, network_checker=self.network_checker)
+        self.slack = SlackNotifier(slack_config, network_checker=self.network_checker,
+                                   session=self.http_session)
 
         # Device map
         self.device_map = {}
+        self.mac_index = {}  # {device_id or normalized MAC: device info} for webhooks
+        self.polling_devices = ()  # device infos with category 'polling'
+        self.sensor_devices = ()   # device infos of sensor types (graph report), sorted by name
 
         # Webhook server
         self.webhook_server = None
         self.tunnel = None
+        # Webhook events are queued by the HTTP handler and processed by a worker
+        self._event_q = queue.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+        self._event_worker = None
+        # Last webhook event per device: {device_mac: (monotonic_time, status_json)}
+        self._last_webhook_event = OrderedDict()
+        # Keys of recently accepted webhook events (LRU, shared by HTTP handler threads)
+        self._seen_webhook_events = OrderedDict()
+        self._seen_webhook_lock = threading.Lock()
         self.webhook_url = None
 
         # Chart generator
-        self.chart_generator = ChartGenerator()
+        self.chart_generator = ChartGenerator(session=self.http_session)
+
+        # Long-lived workers for concurrent SwitchBot status requests
+        self._poll_executor = ThreadPoolExecutor(max_workers=MAX_POLL_WORKERS, thread_name_prefix='poll')
 
         # Local chart generator (for Raspberry Pi with matplotlib)
-        graph_config = config.get('graph_report', {})
         self.use_local_chart = graph_config.get('use_local_chart', False)
         self.local_chart_generator = None
         self.slack_uploader = None
+        # Process pool for matplotlib rendering (CPU-bound, so threads would serialize on the GIL)
+        self._render_pool = None
 
         if self.use_local_chart:
             if LOCAL_CHART_AVAILABLE:
@@ -243,7 +450,15 @@ class SwitchBotMonitor:
                 bot_token = slack_config.get('bot_token')
                 channel_id = slack_config.get('channels', {}).get('atmos_graph')
                 if bot_token and channel_id:
-                    self.slack_uploader = SlackImageUploader(bot_token, channel_id)
+                    self.slack_uploader = SlackImageUploader(bot_token, channel_id,
+                                                             session=self.http_session)
+                    # Workers start from a clean process, not a fork of this multi-threaded one
+                    start_method = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                                    else 'spawn')
+                    self._render_pool = ProcessPoolExecutor(
+                        max_workers=min(4, os.cpu_count() or 1),
+                        mp_context=multiprocessing.get_context(start_method)
+                    )
                     logging.info("Local chart generator enabled (matplotlib + Slack file upload)")
                 else:
                     logging.warning("Local chart enabled but bot_token or channel_id missing, falling back to URL mode")
@@ -252,17 +467,26 @@ class SwitchBotMonitor:
                 logging.warning("Local chart enabled but matplotlib not available, falling back to URL mode")
                 self.use_local_chart = False
 
-        # Graph report tracking (5-minute interval)
+        # Graph report tracking (5-minute interval, time.monotonic() based)
         self.last_graph_report = 0
+        # Digest of the last sent report summary (skip unchanged reports)
+        self._last_report_digest = None
+        # (report digest, chart_urls) of the last complete QuickChart set
+        self._chart_url_cache = (None, {})
+        # Set when new sensor rows are saved; report is skipped while False
+        self._sensor_dirty = True
+
+        # Adaptive SwitchBot polling: {device_id: (next_poll_at, interval)}, time.monotonic() based
+        self._poll_schedule = {}
 
-        # Netatmo polling tracking (separate interval)
+        # Netatmo polling tracking (separate interval, time.monotonic() based)
         self.last_netatmo_poll = 0
 
-        # Google Nest polling tracking
+        # Google Nest polling tracking (time.monotonic() based)
         self.last_nest_poll = 0
         self.nest_device_states = {}  # Track device connectivity states
 
-        # Outdoor alert tracking (to avoid duplicate alerts)
+        # Outdoor alert tracking (to avoid duplicate alerts, time.monotonic() based)
         self.last_alerts = {
             'rain': {},        # {device_id: last_alert_time}
             'wind': {},        # {device_id: last_alert_time}
@@ -271,6 +495,15 @@ class SwitchBotMonitor:
         }
         # Minimum interval between same type alerts (seconds)
         self.alert_cooldown = 3600  # 1 hour
+        # Consecutive samples meeting an alert condition: {(alert_type, device_id): count}
+        self._alert_run_length = {}
+        # Dashboard time_utc of the latest Netatmo reading: {device_id: time_utc}
+        self._netatmo_sample_times = {}
+        # Sample last counted toward a run: {(alert_type, device_id): time_utc}
+        self._alert_counted_samples = {}
+        # Current wind level index per device (0 = calm), with hysteresis
+        self._wind_levels = {}
+        self._load_alert_cooldowns()
 
         # Initialize garbage collection notifier
         garbage_config = config.get('garbage_collection', {})
@@ -314,11 +547,17 @@ class SwitchBotMonitor:
         port = webhook_config.get('port', 8080)
         path = webhook_config.get('path', '/switchbot/webhook')
 
+        # Start event worker (DB/Slack I/O happens off the HTTP handler thread)
+        self._event_worker = threading.Thread(
+            target=self._process_webhook_events, name='webhook-events', daemon=True
+        )
+        self._event_worker.start()
+
         # Start webhook server
         self.webhook_server = WebhookServer(
             port=port,
             path=path,
-            callback=self.handle_webhook_event
+            callback=self._enqueue_webhook_event
         )
         self.webhook_server.start()
 
@@ -332,10 +571,7 @@ class SwitchBotMonitor:
 
             if self.tunnel.start():
                 # Wait for URL to be available
-                for _ in range(10):
-                    if self.tunnel.public_url:
-                        break
-                    time.sleep(1)
+                self.tunnel.wait_for_url(timeout=10)
 
                 self.webhook_url = self.tunnel.get_webhook_url(path)
                 logging.info("Webhook URL: %s", self.webhook_url)
@@ -348,14 +584,17 @@ class SwitchBotMonitor:
 
         return True
 
-    def cleanup_old_webhooks(self):
+    def cleanup_old_webhooks(self, urls=None):
         """
         Remove all existing webhooks from SwitchBot.
         Called on startup to clean up old Quick Tunnel URLs.
+
+        Args:
+            urls: Registered URLs if already queried (skips another query_webhook call)
         """
         try:
-            current = self.api.query_webhook()
-            urls = current.get('urls', [])
+            if urls is None:
+                urls = self.api.query_webhook().get('urls', [])
 
             if not urls:
                 logging.info("No existing webhooks to clean up")
@@ -381,9 +620,21 @@ class SwitchBotMonitor:
             logging.warning("No webhook URL available")
             return False
 
+        # A named tunnel (fixed hostname) keeps its URL across restarts:
+        # if SwitchBot still has it, skip cleanup and re-registration (saves API quota)
+        urls = None
+        if self.tunnel and self.tunnel.hostname:
+            try:
+                urls = self.api.query_webhook().get('urls', [])
+            except Exception as e:
+                logging.warning("Failed to query webhooks: %s", e)
+            if urls and self.webhook_url in urls:
+                logging.info("Webhook already registered: %s", self.webhook_url)
+                return True
+
         # First, clean up any old webhooks (important for Quick Tunnel)
         # Quick Tunnel generates new URLs on each restart
-        self.cleanup_old_webhooks()
+        self.cleanup_old_webhooks(urls)
 
         # Register new webhook
         try:
@@ -394,6 +645,113 @@ class SwitchBotMonitor:
             logging.error("Failed to register webhook: %s", e)
             return False
 
+    def _enqueue_webhook_event(self, event_data):
+        """
+        Queue a webhook event for the event worker (called by WebhookServer).
+
+        Returns:
+            bool: False if the queue is full (the server answers 503 so SwitchBot retries)
+        """
+        event_key = self._webhook_event_key(event_data)
+        with self._seen_webhook_lock:
+            if event_key in self._seen_webhook_events:
+                self._seen_webhook_events.move_to_end(event_key)
+                logging.debug("Dropping replayed webhook event")
+                return True
+            self._seen_webhook_events[event_key] = None
+            if len(self._seen_webhook_events) > WEBHOOK_SEEN_EVENTS_SIZE:
+                self._seen_webhook_events.popitem(last=False)
+
+        try:
+            self._event_q.put_nowait(event_data)
+        except queue.Full:
+            # Not accepted: forget the key so SwitchBot's retry is processed
+            with self._seen_webhook_lock:
+                self._seen_webhook_events.pop(event_key, None)
+            logging.warning("Webhook event queue full (%d pending), rejecting event",
+                            self._event_q.qsize())
+            return False
+        return True
+
+    def _webhook_event_key(self, event_data):
+        """
+        Build an idempotency key for a webhook event (to drop redeliveries).
+        Events are keyed by type, version, device MAC and timeOfSample when present,
+        otherwise by the whole payload.
+
+        Args:
+            event_data: Raw event data from SwitchBot
+
+        Returns:
+            bytes: 16-byte digest
+        """
+        context = event_data.get('context', {}) if isinstance(event_data, dict) else {}
+        if isinstance(context, dict) and context.get('timeOfSample') is not None:
+            key_source = json.dumps([
+                event_data.get('eventType'), event_data.get('eventVersion'),
+                context.get('deviceMac'), context.get('timeOfSample')
+            ], default=str)
+        else:
+            key_source = json.dumps(event_data, sort_keys=True, default=str)
+        return hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).digest()
+
+    def _process_webhook_events(self):
+        """Event worker loop: handle queued webhook events until None is received."""
+        while True:
+            event_data = self._event_q.get()
+            if event_data is None:
+                break
+            try:
+                self.handle_webhook_event(event_data)
+            except Exception as e:
+                logging.error("Error processing webhook event: %s", e)
+
+    def _find_device_by_mac(self, device_mac):
+        """
+        Look up device info for a webhook MAC.
+        Uses the MAC index; on a miss, falls back to a substring scan of device IDs
+        and adds any match to the index.
+
+        Args:
+            device_mac: Device MAC from the webhook
+
+        Returns:
+            dict or None: Device info
+        """
+        normalized = normalize_mac(device_mac)
+        device_info = self.mac_index.get(device_mac) or self.mac_index.get(normalized)
+        if device_info is None:
+            for dev_id, info in self.device_map.items():
+                if dev_id and normalized in normalize_mac(dev_id):
+                    device_info = self.mac_index[normalized] = info
+                    break
+        return device_info
+
+    def _is_duplicate_webhook(self, device_mac, status):
+        """
+        Check whether a webhook repeats the device's previous status within the debounce window.
+        Records the event as the device's latest otherwise.
+
+        Args:
+            device_mac: Device MAC from the webhook
+            status: Parsed status dict
+
+        Returns:
+            bool: True if the event should be dropped
+        """
+        now = time.monotonic()
+        status_key = json.dumps(status, sort_keys=True, default=str)
+
+        last = self._last_webhook_event.get(device_mac)
+        if last and last[1] == status_key and now - last[0] < WEBHOOK_DEBOUNCE_SECONDS:
+            return True
+
+        self._last_webhook_event[device_mac] = (now, status_key)
+        self._last_webhook_event.move_to_end(device_mac)
+        if len(self._last_webhook_event) > WEBHOOK_DEBOUNCE_MAX_DEVICES:
+            self._last_webhook_event.popitem(last=False)
+        return False
+
     def handle_webhook_event(self, event_data):
         """
         Handle incoming webhook event.
@@ -405,13 +763,12 @@ class SwitchBotMonitor:
             parsed = parse_webhook_event(event_data)
             device_mac = parsed['device_mac']
 
+            if self._is_duplicate_webhook(device_mac, parsed['status']):
+                logging.debug("Dropping duplicate webhook for %s", device_mac)
+                return
+
             # Find device by MAC (device IDs in webhook are MAC addresses)
-            device_info = None
-            for dev_id, info in self.device_map.items():
-                # MAC might be part of device ID or match directly
-                if device_mac and (device_mac in dev_id or dev_id.endswith(device_mac)):
-                    device_info = info
-                    break
+            device_info = self._find_device_by_mac(device_mac) if device_mac else None
 
             if not device_info:
                 logging.debug("Webhook for unknown device MAC: %s", device_mac)
@@ -455,7 +812,8 @@ class SwitchBotMonitor:
 
             # Save sensor data if it's an atmosphere sensor (for graphs)
             if self._is_sensor_device(device_type):
-                self.db.save_sensor_data(device_id, device_name, status)
+                if self.db.save_sensor_data(device_id, device_name, status):
+                    self._sensor_dirty = True
                 logging.debug("Saved webhook sensor data for %s", device_name)
 
             # Send notification based on device category
@@ -475,29 +833,76 @@ class SwitchBotMonitor:
         except Exception as e:
             logging.error("Error handling webhook event: %s", e)
 
+    def _due_polling_devices(self, now):
+        """
+        Return polling devices whose back-off interval has elapsed.
+        Half a base interval of slack absorbs scheduler jitter.
+        """
+        slack = self.monitor_cfg.interval_seconds / 2
+        return tuple(
+            device_info for device_info in self.polling_devices
+            if self._poll_schedule.get(device_info['device_id'], (0, 0))[0] - now <= slack
+        )
+
+    def _reschedule_poll(self, device_id, now, changed):
+        """
+        Double a device's polling interval while its status is unchanged
+        (up to max_interval_seconds); reset it on change.
+        """
+        base = self.monitor_cfg.interval_seconds
+        if changed:
+            interval = base
+        else:
+            previous = self._poll_schedule.get(device_id, (0, base))[1]
+            interval = min(previous * 2, self.monitor_cfg.max_interval_seconds)
+        self._poll_schedule[device_id] = (now + interval, interval)
+
+    def _back_off_all_polls(self, now):
+        """Double every device's polling interval after a SwitchBot rate limit (429)."""
+        cap = self.monitor_cfg.max_interval_seconds
+        for device_info in self.polling_devices:
+            device_id = device_info['device_id']
+            interval = self._poll_schedule.get(device_id, (0, self.monitor_cfg.interval_seconds))[1]
+            interval = min(interval * 2, cap)
+            self._poll_schedule[device_id] = (now + interval, interval)
+
     def poll_devices(self):
-        """Poll devices marked for polling."""
-        polling_devices = [
-            info for info in self.device_map.values()
-            if info['category'] == 'polling'
-        ]
+        """Poll devices marked for polling (stable devices are polled less often)."""
+        if not self.polling_devices:
+            logging.debug("No devices configured for polling")
+            return
 
+        now = time.monotonic()
+        polling_devices = self._due_polling_devices(now)
         if not polling_devices:
-            logging.debug("No devices configured for polling")
+            logging.debug("No polling devices due")
             return
 
-        logging.info("Polling %d devices...", len(polling_devices))
+        logging.info("Polling %d/%d devices...", len(polling_devices), len(self.polling_devices))
+
+        # Fetch all statuses concurrently (each call is a blocking HTTPS round-trip)
+        status_futures = [
+            self._poll_executor.submit(self.api.get_device_status, device_info['device_id'])
+            for device_info in polling_devices
+        ]
+
+        sensor_items = []  # (device_id, device_name, status) saved in one transaction
+        rate_limited = False
+        # Skip building log arguments for suppressed levels
+        root_logger = logging.getLogger()
+        log_info = root_logger.isEnabledFor(logging.INFO)
+        log_debug = root_logger.isEnabledFor(logging.DEBUG)
 
-        for device_info in polling_devices:
+        for device_info, status_future in zip(polling_devices, status_futures):
             device_id = device_info['device_id']
             device_name = device_info['device_name']
             device_type = device_info['device_type']
 
             try:
-                status = self.api.get_device_status(device_id)
+                status = status_future.result()
 
                 # Debug: dump full status for Hub 2 to check if lightLevel exists
-                if 'Hub' in device_type:
+                if log_debug and 'Hub' in device_type:
                     logging.debug("Full status for %s (%s): %s", device_name, device_type, status)
 
                 # Get previous state
@@ -516,15 +921,15 @@ class SwitchBotMonitor:
                 changed = self.db.save_device_state(
                     device_id, device_name, device_type, status
                 )
+                self._reschedule_poll(device_id, now, changed)
 
                 # Always save sensor time series data (for temperature/humidity/CO2 sensors)
                 if self._is_sensor_device(device_type):
-                    self.db.save_sensor_data(device_id, device_name, status)
-                    logging.debug("Saved sensor data for %s", device_name)
+                    sensor_items.append((device_id, device_name, status))
 
                 # Note: For polling devices, we don't send individual notifications
                 # The data is collected for the periodic graph report
-                if changed:
+                if changed and log_info:
                     logging.info(
                         "[Polling] Device %s: temp=%.1f, humidity=%d, CO2=%s",
                         device_name,
@@ -534,10 +939,24 @@ class SwitchBotMonitor:
                     )
 
             except Exception as e:
+                if getattr(getattr(e, 'response', None), 'status_code', None) == 429:
+                    rate_limited = True
                 logging.error("Error polling %s: %s", device_name, e)
-                if self.config.get('slack', {}).get('notify_errors', False) and self.network_checker.is_healthy():
+                if self.slack_cfg.notify_errors and self.network_checker.is_healthy():
                     self.slack.notify_error(str(e), device_name)
 
+        if rate_limited:
+            logging.warning("SwitchBot API rate limit reached; backing off device polling")
+            self._back_off_all_polls(now)
+
+        if sensor_items:
+            try:
+                if any(self.db.save_sensor_data_bulk(sensor_items)):
+                    self._sensor_dirty = True
+                logging.debug("Saved sensor data for %d devices", len(sensor_items))
+            except Exception as e:
+                logging.error("Error saving polled sensor data: %s", e)
+
     def poll_netatmo(self):
         """Poll Netatmo weather station for sensor data."""
         if not self.netatmo_api:
@@ -547,71 +966,47 @@ class SwitchBotMonitor:
 
         try:
             readings = self.netatmo_api.get_all_sensor_readings()
-
             for reading in readings:
-                device_id = reading['device_id']
+                self._netatmo_sample_times[reading.get('device_id')] = reading.get('time_utc')
+
+            # Save all readings to database in one transaction
+            saved_flags = self.db.save_netatmo_data_bulk(readings)
+            if any(saved_flags):
+                self._sensor_dirty = True
+
+            log_readings = logging.getLogger().isEnabledFor(logging.INFO)
+            notify_futures = []
+
+            for reading, saved in zip(readings, saved_flags):
                 device_name = reading['device_name']
                 station_name = reading.get('station_name', '')
                 module_type = reading.get('module_type', '')
                 is_outdoor = reading.get('is_outdoor', False)
 
-                # Save to database
-                saved = self.db.save_netatmo_data(
-                    device_id=device_id,
-                    device_name=device_name,
-                    station_name=station_name,
-                    module_type=module_type,
-                    is_outdoor=is_outdoor,
-                    temperature=reading.get('temperature'),
-                    humidity=reading.get('humidity'),
-                    co2=reading.get('co2'),
-                    pressure=reading.get('pressure'),
-                    noise=reading.get('noise'),
-                    wind_strength=reading.get('wind_strength'),
-                    wind_angle=reading.get('wind_angle'),
-                    gust_strength=reading.get('gust_strength'),
-                    gust_angle=reading.get('gust_angle'),
-                    rain=reading.get('rain'),
-                    rain_1h=reading.get('rain_1h'),
-                    rain_24h=reading.get('rain_24h'),
-                    battery_percent=reading.get('battery_percent')
-                )
-
                 if saved:
-                    location = "屋外" if is_outdoor else "屋内"
-                    parts = []
-                    if reading.get('temperature') is not None:
-                        parts.append("temp={:.1f}".format(reading['temperature']))
-                    if reading.get('humidity') is not None:
-                        parts.append("humidity={}".format(reading['humidity']))
-                    if reading.get('co2') is not None:
-                        parts.append("CO2={}".format(reading['co2']))
-                    if reading.get('pressure') is not None:
-                        parts.append("pressure={:.1f}".format(reading['pressure']))
-                    if reading.get('noise') is not None:
-                        parts.append("noise={}".format(reading['noise']))
-                    if reading.get('wind_strength') is not None:
-                        parts.append("wind={}km/h".format(reading['wind_strength']))
-                    if reading.get('gust_strength') is not None:
-                        parts.append("gust={}km/h".format(reading['gust_strength']))
-                    if reading.get('wind_angle') is not None:
-                        parts.append("dir={}°".format(reading['wind_angle']))
-                    if reading.get('rain') is not None:
-                        parts.append("rain={}mm".format(reading['rain']))
-                    if reading.get('rain_1h') is not None:
-                        parts.append("rain1h={}mm".format(reading['rain_1h']))
-                    if reading.get('rain_24h') is not None:
-                        parts.append("rain24h={}mm".format(reading['rain_24h']))
-
-                    logging.info(
-                        "[Netatmo] %s (%s/%s): %s",
-                        device_name, station_name, location, ", ".join(parts)
-                    )
-
-                    # Send Slack notification to #atmos-update
-                    self.slack.notify_netatmo_update(
+                    if log_readings:
+                        location = "屋外" if is_outdoor else "屋内"
+                        parts = [
+                            fmt.format(reading[key])
+                            for key, fmt in NETATMO_LOG_FIELDS
+                            if reading.get(key) is not None
+                        ]
+                        logging.info(
+                            "[Netatmo] %s (%s/%s): %s",
+                            device_name, station_name, location, ", ".join(parts)
+                        )
+
+                    # Send Slack notification to #atmos-update (modules post concurrently)
+                    notify_futures.append(self._poll_executor.submit(
+                        self.slack.notify_netatmo_update,
                         device_name, module_type, is_outdoor, reading
-                    )
+                    ))
+
+            for future in notify_futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error("Error sending Netatmo notification: %s", e)
 
             logging.info("Netatmo polling complete: %d readings", len(readings))
 
@@ -620,7 +1015,7 @@ class SwitchBotMonitor:
 
         except Exception as e:
             logging.error("Error polling Netatmo: %s", e)
-            if self.config.get('slack', {}).get('notify_errors', False) and self.network_checker.is_healthy():
+            if self.slack_cfg.notify_errors and self.network_checker.is_healthy():
                 self.slack.notify_error("Netatmo: {}".format(str(e)))
 
     def poll_nest(self):
@@ -682,7 +1077,7 @@ class SwitchBotMonitor:
 
         except Exception as e:
             logging.error("Error polling Google Nest: %s", e)
-            if self.config.get('slack', {}).get('notify_errors', False) and self.network_checker.is_healthy():
+            if self.slack_cfg.notify_errors and self.network_checker.is_healthy():
                 self.slack.notify_error("Google Nest: {}".format(str(e)))
 
     def handle_nest_event(self, event_type, device_id, device_name, event_data):
@@ -706,8 +1101,9 @@ class SwitchBotMonitor:
             clip_downloaded = False
             clip_path = None
 
-            logging.debug("Event data keys: %s", list(event_data.keys()))
-            logging.debug("Preview URL: %s", preview_url[:50] if preview_url else None)
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("Event data keys: %s", list(event_data.keys()))
+                logging.debug("Preview URL: %s", preview_url[:50] if preview_url else None)
 
             # Try to download clip preview
             if preview_url and self.nest_pubsub:
@@ -771,15 +1167,36 @@ class SwitchBotMonitor:
 
     def _can_send_alert(self, alert_type, device_id):
         """Check if we can send an alert (respecting cooldown)."""
-        now = time.time()
-        last_time = self.last_alerts.get(alert_type, {}).get(device_id, 0)
-        return now - last_time >= self.alert_cooldown
+        last_time = self.last_alerts.get(alert_type, {}).get(device_id)
+        if last_time is None:
+            return True
+        return time.monotonic() - last_time >= self.alert_cooldown
 
     def _mark_alert_sent(self, alert_type, device_id):
-        """Mark that an alert was sent."""
+        """Mark that an alert was sent (persisted so the cooldown survives restarts)."""
         if alert_type not in self.last_alerts:
             self.last_alerts[alert_type] = {}
-        self.last_alerts[alert_type][device_id] = time.time()
+        self.last_alerts[alert_type][device_id] = time.monotonic()
+        try:
+            self.db.set_alert_cooldown(alert_type, device_id, time.time())
+        except Exception as e:
+            logging.warning("Failed to persist alert cooldown: %s", e)
+
+    def _load_alert_cooldowns(self):
+        """Restore persisted alert times into last_alerts (converted to monotonic time)."""
+        try:
+            cooldowns = self.db.get_alert_cooldowns()
+        except Exception as e:
+            logging.warning("Failed to load alert cooldowns: %s", e)
+            return
+
+        # Wall-clock is only used across restarts; convert to the monotonic clock here
+        wall_now = time.time()
+        mono_now = time.monotonic()
+        for (alert_type, device_id), last_alert_at in cooldowns.items():
+            age = wall_now - last_alert_at
+            if 0 <= age < self.alert_cooldown:
+                self.last_alerts.setdefault(alert_type, {})[device_id] = mono_now - age
 
     def check_outdoor_alerts(self):
         """
@@ -794,139 +1211,162 @@ class SwitchBotMonitor:
             return
 
         # Get outdoor alert channel config
-        outdoor_channel = self.config.get('slack', {}).get('channels', {}).get('outdoor_alert')
-        if not outdoor_channel:
+        if not self.slack_cfg.outdoor_alert_channel:
             logging.debug("Outdoor alert channel not configured, skipping alerts")
             return
 
-        netatmo_devices = self.db.get_all_netatmo_devices()
+        # Alert check per module type (other modules have no alerts)
+        checks = {
+            'NAModule3': self._check_rain_alert,         # Rain gauge
+            'NAModule2': self._check_wind_alert,         # Wind gauge
+            'NAModule1': self._check_temperature_alert,  # Outdoor module
+            'NAMain': self._check_pressure_alert,        # Main station
+        }
 
-        for device in netatmo_devices:
-            device_id = device['device_id']
-            device_name = device['device_name']
-            module_type = device.get('module_type', '')
+        # Latest, previous, 6h-ago and yesterday rows for every device in one pass
+        snapshot = self.db.get_netatmo_alert_snapshot()
 
-            try:
-                # Get latest and previous data
-                latest = self.db.get_latest_netatmo_data(device_id)
-                if not latest:
-                    continue
-
-                previous = self.db.get_previous_netatmo_data(device_id)
+        for device_id, data in snapshot.items():
+            latest = data['latest']
+            check = checks.get(latest.get('module_type'))
+            if check is None:
+                continue
 
-                # === Rain Alert (NAModule3) ===
-                if module_type == 'NAModule3':
-                    self._check_rain_alert(device_id, device_name, latest, previous)
+            device_name = latest['device_name']
+            try:
+                check(device_id, device_name, data)
+            except Exception as e:
+                logging.error("Error checking outdoor alerts for %s: %s", device_name, e)
 
-                # === Wind Alert (NAModule2) ===
-                if module_type == 'NAModule2':
-                    self._check_wind_alert(device_id, device_name, latest)
+    def _is_new_sample(self, alert_type, device_id):
+        """
+        Check whether the device's latest reading has not yet been counted for this alert.
+        A cached or re-polled dashboard repeats time_utc and is not a new sample.
+        """
+        sample_time = self._netatmo_sample_times.get(device_id)
+        if sample_time is None:
+            return True
+        key = (alert_type, device_id)
+        if self._alert_counted_samples.get(key) == sample_time:
+            return False
+        self._alert_counted_samples[key] = sample_time
+        return True
 
-                # === Temperature Alert (outdoor modules) ===
-                if module_type == 'NAModule1':
-                    self._check_temperature_alert(device_id, device_name, latest)
+    def _update_run_length(self, alert_type, device_id, condition):
+        """
+        Track consecutive samples meeting an alert condition.
 
-                # === Pressure Alert (main station) ===
-                if module_type == 'NAMain':
-                    self._check_pressure_alert(device_id, device_name, latest)
+        Returns:
+            int: Current run length (0 if the condition is not met)
+        """
+        key = (alert_type, device_id)
+        run_length = self._alert_run_length.get(key, 0) + 1 if condition else 0
+        self._alert_run_length[key] = run_length
+        return run_length
+
+    def _check_rain_alert(self, device_id, device_name, data):
+        """Check if rain started (rain must persist for ALERT_CONFIRM_SAMPLES samples)."""
+        if not self._is_new_sample('rain', device_id):
+            return
+        latest = data['latest']
+        previous = data['previous']
+        current_rain = latest.get('rain')
+        raining = current_rain is not None and current_rain > 0
 
-            except Exception as e:
-                logging.error("Error checking outdoor alerts for %s: %s", device_name, e)
+        # First check after startup: rain already ongoing in the previous sample
+        # is not a new start
+        key = ('rain', device_id)
+        if key not in self._alert_run_length and previous and previous.get('rain'):
+            self._alert_run_length[key] = ALERT_CONFIRM_SAMPLES
 
-    def _check_rain_alert(self, device_id, device_name, latest, previous):
-        """Check if rain started."""
+        # Rain started: ALERT_CONFIRM_SAMPLES consecutive samples > 0 after a dry one
+        if self._update_run_length('rain', device_id, raining) != ALERT_CONFIRM_SAMPLES:
+            return
         if not self._can_send_alert('rain', device_id):
             return
 
-        current_rain = latest.get('rain')
-        previous_rain = previous.get('rain') if previous else None
-
-        # Rain started: was 0 (or None), now > 0
-        if current_rain is not None and current_rain > 0:
-            if previous_rain is None or previous_rain == 0:
-                message = "雨が降り始めました"
-                details = "現在の雨量: {:.1f}mm | 24h累計: {}mm".format(
-                    current_rain,
-                    latest.get('rain_24h', '-')
-                )
-                self.slack.notify_outdoor_alert('rain', message, details, level='info')
-                self._mark_alert_sent('rain', device_id)
-                logging.info("[Alert] Rain started: %s", device_name)
-
-    def _check_wind_alert(self, device_id, device_name, latest):
-        """Check for strong wind conditions."""
-        if not self._can_send_alert('wind', device_id):
-            return
+        message = "雨が降り始めました"
+        details = f"現在の雨量: {current_rain:.1f}mm | 24h累計: {latest.get('rain_24h', '-')}mm"
+        self.slack.notify_outdoor_alert('rain', message, details, level='info')
+        self._mark_alert_sent('rain', device_id)
+        logging.info("[Alert] Rain started: %s", device_name)
 
+    def _wind_level(self, device_id, speed):
+        """
+        Determine wind level index (0 = calm) with hysteresis.
+        A level is entered at its enter threshold and kept until speed drops below its exit threshold.
+        """
+        previous_level = self._wind_levels.get(device_id, 0)
+        level = 0
+        for index, (enter, exit_, _, _) in enumerate(WIND_ALERT_LEVELS, 1):
+            threshold = exit_ if index <= previous_level else enter
+            if speed >= threshold:
+                level = index
+        self._wind_levels[device_id] = level
+        return level
+
+    def _check_wind_alert(self, device_id, device_name, data):
+        """Check for strong wind conditions (must persist for ALERT_CONFIRM_SAMPLES samples)."""
+        latest = data['latest']
         wind_strength = latest.get('wind_strength')
         gust_strength = latest.get('gust_strength')
 
-        if wind_strength is None:
+        if wind_strength is None or not self._is_new_sample('wind', device_id):
             return
 
-        # Wind thresholds (km/h) based on Japan Meteorological Agency
-        # 10m/s = 36km/h: やや強い風 (傘がさせない)
-        # 15m/s = 54km/h: 強い風 (風に向かって歩けない)
-        # 20m/s = 72km/h: 非常に強い風 (立っていられない)
+        # Either sustained wind or gusts can trigger a level
+        wind_level = self._wind_level(device_id, max(wind_strength, gust_strength or 0))
+        if self._update_run_length('wind', device_id, wind_level > 0) < ALERT_CONFIRM_SAMPLES:
+            return
+        if not self._can_send_alert('wind', device_id):
+            return
 
-        message = None
-        level = 'info'
+        _, _, level, message = WIND_ALERT_LEVELS[wind_level - 1]
 
-        if wind_strength >= 72 or (gust_strength and gust_strength >= 72):
-            message = "非常に強い風（暴風）です"
-            level = 'danger'
-        elif wind_strength >= 54 or (gust_strength and gust_strength >= 54):
-            message = "強い風です。風に向かって歩きにくくなります"
-            level = 'warning'
-        elif wind_strength >= 36 or (gust_strength and gust_strength >= 36):
-            message = "やや強い風です。傘がさしにくくなります"
-            level = 'info'
+        details = f"風速: {wind_strength}km/h"
+        if gust_strength:
+            details += f" | 突風: {gust_strength}km/h"
+        self.slack.notify_outdoor_alert('wind', message, details, level=level)
+        self._mark_alert_sent('wind', device_id)
+        logging.info("[Alert] Strong wind: %s - %dkm/h", device_name, wind_strength)
 
-        if message:
-            details = "風速: {}km/h".format(wind_strength)
-            if gust_strength:
-                details += " | 突風: {}km/h".format(gust_strength)
-            self.slack.notify_outdoor_alert('wind', message, details, level=level)
-            self._mark_alert_sent('wind', device_id)
-            logging.info("[Alert] Strong wind: %s - %dkm/h", device_name, wind_strength)
-
-    def _check_temperature_alert(self, device_id, device_name, latest):
-        """Check temperature change vs yesterday same time."""
+    def _check_temperature_alert(self, device_id, device_name, data):
+        """Check temperature change vs yesterday same time (reading ~24h ago)."""
         if not self._can_send_alert('temperature', device_id):
             return
 
-        current_temp = latest.get('temperature')
+        current_temp = data['latest'].get('temperature')
         if current_temp is None:
             return
 
-        # Get yesterday's data at same time
-        yesterday = self.db.get_netatmo_data_yesterday_same_time(device_id)
+        yesterday = data['yesterday']
         if not yesterday or yesterday.get('temperature') is None:
             return
 
         yesterday_temp = yesterday['temperature']
         temp_diff = current_temp - yesterday_temp
 
-        # Alert if temperature changed by 2°C or more
-        if abs(temp_diff) >= 2.0:
+        # Alert if temperature changed by TEMPERATURE_ALERT_DIFF or more
+        if abs(temp_diff) >= TEMPERATURE_ALERT_DIFF:
             if temp_diff > 0:
-                message = "昨日より{:.1f}°C暑いです".format(temp_diff)
+                message = f"昨日より{temp_diff:.1f}°C暑いです"
                 alert_type = 'temperature_hot'
             else:
-                message = "昨日より{:.1f}°C寒いです".format(abs(temp_diff))
+                message = f"昨日より{-temp_diff:.1f}°C寒いです"
                 alert_type = 'temperature_cold'
 
-            details = "現在: {:.1f}°C | 昨日同時刻: {:.1f}°C".format(current_temp, yesterday_temp)
+            details = f"現在: {current_temp:.1f}°C | 昨日同時刻: {yesterday_temp:.1f}°C"
 
-            level = 'warning' if abs(temp_diff) >= 5.0 else 'info'
+            level = 'warning' if abs(temp_diff) >= TEMPERATURE_WARNING_DIFF else 'info'
             self.slack.notify_outdoor_alert(alert_type, message, details, level=level)
             self._mark_alert_sent('temperature', device_id)
             logging.info("[Alert] Temperature change: %s - %.1f°C diff", device_name, temp_diff)
 
-    def _check_pressure_alert(self, device_id, device_name, latest):
+    def _check_pressure_alert(self, device_id, device_name, data):
         """
-        Check pressure changes for headache/weather sickness alerts.
-        Based on research:
+        Check pressure changes for headache/weather sickness alerts
+        (vs the reading closest to 6 hours ago).
+        Based on research (see PRESSURE_ALERT_LEVELS):
         - 4hPa change in 6 hours: mild warning
         - 6hPa change in 6 hours: moderate warning (headache likely)
         - 10hPa change in 6 hours: severe warning
@@ -934,45 +1374,32 @@ class SwitchBotMonitor:
         if not self._can_send_alert('pressure', device_id):
             return
 
-        current_pressure = latest.get('pressure')
+        current_pressure = data['latest'].get('pressure')
         if current_pressure is None:
             return
 
-        # Get pressure from 6 hours ago
-        data_6h_ago = self.db.get_netatmo_data_hours_ago(device_id, 6)
+        data_6h_ago = data['h6_ago']
         if not data_6h_ago or data_6h_ago.get('pressure') is None:
             return
 
         pressure_6h_ago = data_6h_ago['pressure']
         pressure_diff = current_pressure - pressure_6h_ago
 
-        # Determine alert level
-        message = None
-        level = 'info'
-        alert_type = 'pressure_down' if pressure_diff < 0 else 'pressure_up'
-
+        # Determine alert level (first matching threshold, most severe first)
+        falling = pressure_diff < 0
+        alert_type = 'pressure_down' if falling else 'pressure_up'
         abs_diff = abs(pressure_diff)
 
-        if abs_diff >= 10:
-            # Severe: rapid pressure change
-            direction = "低下" if pressure_diff < 0 else "上昇"
-            message = "気圧が急激に{}しています（気象病警戒）".format(direction)
-            level = 'danger'
-        elif abs_diff >= 6:
-            # Moderate: headache likely
-            direction = "下がって" if pressure_diff < 0 else "上がって"
-            message = "気圧が{}います。頭痛に注意".format(direction)
-            level = 'warning'
-        elif abs_diff >= 4:
-            # Mild: slight warning
-            direction = "低下傾向" if pressure_diff < 0 else "上昇傾向"
-            message = "気圧が{}です".format(direction)
-            level = 'info'
+        for threshold, level, falling_message, rising_message in PRESSURE_ALERT_LEVELS:
+            if abs_diff >= threshold:
+                message = falling_message if falling else rising_message
+                break
+        else:
+            message = None
 
         if message:
-            details = "現在: {:.1f}hPa | 6時間前: {:.1f}hPa | 変化: {:+.1f}hPa".format(
-                current_pressure, pressure_6h_ago, pressure_diff
-            )
+            details = (f"現在: {current_pressure:.1f}hPa | 6時間前: {pressure_6h_ago:.1f}hPa"
+                       f" | 変化: {pressure_diff:+.1f}hPa")
 
             # Add low pressure warning if below 1000hPa
             if current_pressure < 1000:
@@ -984,19 +1411,11 @@ class SwitchBotMonitor:
 
     def _is_sensor_device(self, device_type):
         """Check if device type is a sensor that records time series data."""
-        sensor_types = [
-            'Meter', 'MeterPlus', 'MeterPro', 'MeterPro(CO2)',
-            'WoIOSensor', 'Hub 2', 'Hub 3', 'Outdoor Meter'
-        ]
-        return device_type in sensor_types
+        return device_type in SENSOR_DEVICE_TYPES
 
     def _is_outdoor_sensor(self, device_name):
         """Check if device is an outdoor sensor."""
-        outdoor_keywords = ['防水温湿度計', '屋外', 'Outdoor']
-        for keyword in outdoor_keywords:
-            if keyword in device_name:
-                return True
-        return False
+        return is_outdoor_sensor(device_name)
 
     def send_graph_report(self):
         """
@@ -1005,13 +1424,27 @@ class SwitchBotMonitor:
         Separates outdoor and indoor sensors.
         Includes both SwitchBot and Netatmo sensors.
         """
+        if not self._sensor_dirty:
+            logging.debug("No new sensor data since last graph report, skipping")
+            return
+        # Cleared before reading so rows saved by concurrent polls mark it dirty again
+        self._sensor_dirty = False
+        try:
+            self._build_and_send_graph_report()
+        except Exception:
+            self._sensor_dirty = True  # retry on next cycle
+            raise
+
+    def _build_and_send_graph_report(self):
+        """Read the last 24 hours of sensor data, render charts and post the report."""
         logging.info("Generating graph report for last 24 hours...")
 
         # Label for chart titles
         date_str = "直近24h"
 
         # Get all SwitchBot sensor devices
-        sensor_devices = self.db.get_all_sensor_devices()
+        # Sensor devices from the device map (DB scan only if the map is unavailable)
+        sensor_devices = self.sensor_devices or self.db.get_all_sensor_devices()
 
         # Separate outdoor and indoor sensor data
         outdoor_data = {}  # {device_name: sensor_data_list}
@@ -1025,24 +1458,33 @@ class SwitchBotMonitor:
         light_level_data = {}  # {device_name: sensor_data_list} for light level sensors
         devices_summary = []
 
+        # Last 24 hours of all SwitchBot sensors in one query
+        sensor_data_by_device = self.db.get_all_sensor_data_last_hours(24)
+
         # Process SwitchBot sensors
         for device in sensor_devices:
             device_id = device['device_id']
             device_name = device['device_name']
 
             try:
-                # Get last 24 hours data
-                sensor_data = self.db.get_sensor_data_last_24h(device_id)
+                sensor_data = sensor_data_by_device.get(device_id)
 
                 if not sensor_data:
                     logging.debug("No data for %s in last 24 hours", device_name)
                     continue
 
-                # Separate outdoor vs indoor
-                if self._is_outdoor_sensor(device_name):
-                    outdoor_data["[SB] " + device_name] = sensor_data
+                # Display name and outdoor flag precomputed in device map
+                info = self.device_map.get(device_id)
+                if info and info['device_name'] == device_name:
+                    display_name = info['display_name']
+                    is_outdoor = info['is_outdoor']
                 else:
-                    indoor_data["[SB] " + device_name] = sensor_data
+                    display_name = "[SB] " + device_name
+                    is_outdoor = self._is_outdoor_sensor(device_name)
+
+                # Separate outdoor vs indoor
+                bucket = outdoor_data if is_outdoor else indoor_data
+                bucket[display_name] = sensor_data
 
                 # Collect devices with light_level data
                 has_light_level = any(
@@ -1050,23 +1492,15 @@ class SwitchBotMonitor:
                     for reading in sensor_data
                 )
                 if has_light_level:
-                    light_level_data["[SB] " + device_name] = sensor_data
+                    light_level_data[display_name] = sensor_data
 
-                # Get latest values for summary
-                latest = sensor_data[-1] if sensor_data else {}
-                is_outdoor = self._is_outdoor_sensor(device_name)
+                # Latest values for summary (SwitchBot rows have no Netatmo fields)
+                latest = sensor_data[-1]
                 devices_summary.append({
-                    'device_name': "[SB] " + device_name,
+                    'device_name': display_name,
                     'source': 'SwitchBot',
                     'module_type': 'SwitchBot',
-                    'temperature': {'latest': latest.get('temperature', '-')},
-                    'humidity': {'latest': latest.get('humidity', '-')},
-                    'co2': {'latest': latest.get('co2', '-')},
-                    'pressure': {'latest': '-'},
-                    'noise': {'latest': '-'},
-                    'wind_strength': {'latest': '-'},
-                    'rain_24h': {'latest': '-'},
-                    'light_level': {'latest': latest.get('light_level', '-')},
+                    'latest': SensorLatest._make(map(latest.get, SensorLatest._fields)),
                     'is_outdoor': is_outdoor
                 })
 
@@ -1076,6 +1510,8 @@ class SwitchBotMonitor:
         # Process Netatmo sensors
         if self.netatmo_api:
             netatmo_devices = self.db.get_all_netatmo_devices()
+            # Last 24 hours of all Netatmo modules in one query
+            netatmo_data_by_device = self.db.get_all_netatmo_data_last_hours(24)
 
             for device in netatmo_devices:
                 device_id = device['device_id']
@@ -1084,8 +1520,7 @@ class SwitchBotMonitor:
                 is_outdoor = device.get('is_outdoor', False)
 
                 try:
-                    # Get last 24 hours data
-                    sensor_data = self.db.get_netatmo_data_last_24h(device_id)
+                    sensor_data = netatmo_data_by_device.get(device_id)
 
                     if not sensor_data:
                         logging.debug("No Netatmo data for %s in last 24 hours", device_name)
@@ -1111,21 +1546,13 @@ class SwitchBotMonitor:
                             pressure_data[display_name] = sensor_data
                             noise_data[display_name] = sensor_data
 
-                    # Get latest values for summary
-                    latest = sensor_data[-1] if sensor_data else {}
+                    # Latest values for summary
+                    latest = sensor_data[-1]
                     devices_summary.append({
                         'device_name': display_name,
                         'source': 'Netatmo',
                         'module_type': module_type,
-                        'temperature': {'latest': latest.get('temperature', '-')},
-                        'humidity': {'latest': latest.get('humidity', '-')},
-                        'co2': {'latest': latest.get('co2', '-')},
-                        'pressure': {'latest': latest.get('pressure', '-')},
-                        'noise': {'latest': latest.get('noise', '-')},
-                        'wind_strength': {'latest': latest.get('wind_strength', '-')},
-                        'gust_strength': {'latest': latest.get('gust_strength', '-')},
-                        'rain': {'latest': latest.get('rain', '-')},
-                        'rain_24h': {'latest': latest.get('rain_24h', '-')},
+                        'latest': SensorLatest._make(map(latest.get, SensorLatest._fields)),
                         'is_outdoor': is_outdoor
                     })
 
@@ -1136,102 +1563,107 @@ class SwitchBotMonitor:
             logging.info("No sensor data collected for graph report")
             return
 
+        # Skip when the latest values are the same as the last sent report
+        # (the digest also keys the QuickChart URL cache below)
+        report_digest = hashlib.blake2b(
+            json.dumps(devices_summary, sort_keys=True, default=str).encode('utf-8'),
+            digest_size=16
+        ).digest()
+        if report_digest == self._last_report_digest:
+            logging.info("Skipping unchanged graph report")
+            return
+
         # Generate charts
         # Get interval for downsampling from graph_report config (default: 10 minutes)
-        interval_seconds = self.config.get('graph_report', {}).get('downsample_seconds', 600)
+        interval_seconds = self.graph_cfg.downsample_seconds
 
         # Use local chart generator if enabled (Raspberry Pi mode)
         if self.use_local_chart and self.local_chart_generator and self.slack_uploader:
-            self._send_local_chart_report(
+            if self._send_local_chart_report(
                 outdoor_data, indoor_data, wind_data, rain_data,
                 pressure_data, noise_data, light_level_data, date_str, interval_seconds
-            )
+            ):
+                self._last_report_digest = report_digest
+            else:
+                self._sensor_dirty = True  # retry on next cycle
             return
 
         # Default: Use QuickChart.io URL mode
-        chart_urls = {}
-        try:
-            # Outdoor charts (temperature, humidity)
-            if outdoor_data:
-                chart_urls['outdoor_temp'] = self.chart_generator.generate_multi_device_chart(
-                    outdoor_data, 'temperature', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                chart_urls['outdoor_humidity'] = self.chart_generator.generate_multi_device_chart(
-                    outdoor_data, 'humidity', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated outdoor charts")
-
-            # Indoor charts (temperature, humidity, CO2)
-            if indoor_data:
-                chart_urls['indoor_temp'] = self.chart_generator.generate_multi_device_chart(
-                    indoor_data, 'temperature', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                chart_urls['indoor_humidity'] = self.chart_generator.generate_multi_device_chart(
-                    indoor_data, 'humidity', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                chart_urls['co2'] = self.chart_generator.generate_multi_device_chart(
-                    indoor_data, 'co2', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated indoor charts")
-
-            # Pressure chart (Netatmo main station only)
-            if pressure_data:
-                chart_urls['pressure'] = self.chart_generator.generate_multi_device_chart(
-                    pressure_data, 'pressure', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated pressure chart")
-
-            # Noise chart (Netatmo main station only)
-            if noise_data:
-                chart_urls['noise'] = self.chart_generator.generate_multi_device_chart(
-                    noise_data, 'noise', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated noise chart")
-
-            # Wind chart (Netatmo NAModule2) - combined wind speed and gust
-            if wind_data:
-                chart_urls['wind'] = self.chart_generator.generate_wind_chart(
-                    wind_data, date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                # Wind direction chart
-                chart_urls['wind_direction'] = self.chart_generator.generate_wind_direction_chart(
-                    wind_data, date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated wind charts")
-
-            # Rain chart (Netatmo NAModule3) - combined bar (1h) and line (24h)
-            if rain_data:
-                chart_urls['rain'] = self.chart_generator.generate_rain_chart(
-                    rain_data, date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated rain chart")
-
-            # Light level chart (SwitchBot Hub 2, Contact Sensor, Motion Sensor)
-            if light_level_data:
-                chart_urls['light_level'] = self.chart_generator.generate_multi_device_chart(
-                    light_level_data, 'light_level', date_str, use_short_url=True,
-                    interval_seconds=interval_seconds
-                )
-                logging.debug("Generated light level chart")
+        # Each chart is an independent short-URL request, so fetch them concurrently
+        generator = self.chart_generator
+        jobs = []  # [(chart_key, func, args)]
+        # Outdoor charts (temperature, humidity)
+        if outdoor_data:
+            jobs.append(('outdoor_temp', generator.generate_multi_device_chart,
+                         (outdoor_data, 'temperature', date_str)))
+            jobs.append(('outdoor_humidity', generator.generate_multi_device_chart,
+                         (outdoor_data, 'humidity', date_str)))
+        # Indoor charts (temperature, humidity, CO2)
+        if indoor_data:
+            jobs.append(('indoor_temp', generator.generate_multi_device_chart,
+                         (indoor_data, 'temperature', date_str)))
+            jobs.append(('indoor_humidity', generator.generate_multi_device_chart,
+                         (indoor_data, 'humidity', date_str)))
+            jobs.append(('co2', generator.generate_multi_device_chart,
+                         (indoor_data, 'co2', date_str)))
+        # Pressure / noise charts (Netatmo main station only)
+        if pressure_data:
+            jobs.append(('pressure', generator.generate_multi_device_chart,
+                         (pressure_data, 'pressure', date_str)))
+        if noise_data:
+            jobs.append(('noise', generator.generate_multi_device_chart,
+                         (noise_data, 'noise', date_str)))
+        # Wind charts (Netatmo NAModule2) - combined wind speed and gust, direction
+        if wind_data:
+            jobs.append(('wind', generator.generate_wind_chart, (wind_data, date_str)))
+            jobs.append(('wind_direction', generator.generate_wind_direction_chart,
+                         (wind_data, date_str)))
+        # Rain chart (Netatmo NAModule3) - combined bar (1h) and line (24h)
+        if rain_data:
+            jobs.append(('rain', generator.generate_rain_chart, (rain_data, date_str)))
+        # Light level chart (SwitchBot Hub 2, Contact Sensor, Motion Sensor)
+        if light_level_data:
+            jobs.append(('light_level', generator.generate_multi_device_chart,
+                         (light_level_data, 'light_level', date_str)))
 
-        except Exception as e:
-            logging.error("Error generating chart: %s", e)
+        chart_urls = {}
+        cached_digest, cached_urls = self._chart_url_cache
+        if jobs and cached_digest == report_digest:
+            # Same data as a report whose send failed: reuse its chart URLs
+            chart_urls = dict(cached_urls)
+            logging.debug("Reusing %d cached chart URLs", len(chart_urls))
+        elif jobs:
+            executor = ThreadPoolExecutor(max_workers=min(MAX_CHART_URL_WORKERS, len(jobs)))
+            futures = {
+                executor.submit(
+                    func, *args, use_short_url=True, interval_seconds=interval_seconds
+                ): chart_key
+                for chart_key, func, args in jobs
+            }
+            # One deadline for the whole batch; stragglers are skipped, not waited on
+            done, not_done = wait(futures, timeout=CHART_URL_TIMEOUT_SECONDS)
+            for future in not_done:
+                future.cancel()
+                logging.error("Timed out generating chart %s", futures[future])
+            executor.shutdown(wait=False)
+            for future in done:
+                try:
+                    chart_urls[futures[future]] = future.result()
+                except Exception as e:
+                    logging.error("Error generating chart %s: %s", futures[future], e)
+            logging.debug("Generated %d/%d charts", len(chart_urls), len(jobs))
+            if len(chart_urls) == len(jobs):
+                self._chart_url_cache = (report_digest, dict(chart_urls))
 
         # Send to Slack #atmos-graph channel
         try:
-            self.slack.notify_atmos_graph(date_str, devices_summary, chart_urls)
+            if self.slack.notify_atmos_graph(date_str, devices_summary, chart_urls):
+                self._last_report_digest = report_digest
+            else:
+                self._sensor_dirty = True  # retry on next cycle
             logging.info("Sent graph report to #atmos-graph")
         except Exception as e:
+            self._sensor_dirty = True
             logging.error("Error sending graph report: %s", e)
 
     def _send_local_chart_report(self, outdoor_data, indoor_data, wind_data, rain_data,
@@ -1244,6 +1676,11 @@ class SwitchBotMonitor:
         Generates two sets of charts:
         - 12h charts with current downsample interval
         - 24h charts with 30-minute downsample interval
+
+        Charts are rendered in parallel on the process pool (one chart per worker).
+
+        Returns:
+            bool: True if at least one chart was uploaded
         """
         logging.info("Generating local charts with matplotlib...")
 
@@ -1253,96 +1690,62 @@ class SwitchBotMonitor:
         interval_12h = interval_seconds
         interval_24h = 1800  # 30 minutes
 
-        chart_paths = {}
-        try:
-            # Generate 12h and 24h charts for each metric
-            for hours, interval, suffix in [(12, interval_12h, '_12h'), (24, interval_24h, '_24h')]:
-                # Outdoor charts
-                if outdoor_data:
-                    chart_paths['outdoor_temp' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        outdoor_data, 'temperature', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='outdoor'
-                    )
-                    chart_paths['outdoor_humidity' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        outdoor_data, 'humidity', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='outdoor'
-                    )
-
-                # Indoor charts
-                if indoor_data:
-                    chart_paths['indoor_temp' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        indoor_data, 'temperature', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='indoor'
-                    )
-                    chart_paths['indoor_humidity' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        indoor_data, 'humidity', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='indoor'
-                    )
-                    chart_paths['co2' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        indoor_data, 'co2', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='indoor'
-                    )
-
-                # Pressure chart
-                if pressure_data:
-                    chart_paths['pressure' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        pressure_data, 'pressure', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='pressure'
-                    )
-
-                # Noise chart
-                if noise_data:
-                    chart_paths['noise' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        noise_data, 'noise', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='noise'
-                    )
-
-                # Wind charts
-                if wind_data:
-                    chart_paths['wind' + suffix] = self.local_chart_generator.generate_wind_chart(
-                        wind_data, date_str,
-                        interval_seconds=interval, hours_range=hours
-                    )
-                    chart_paths['wind_direction' + suffix] = self.local_chart_generator.generate_wind_direction_chart(
-                        wind_data, date_str,
-                        interval_seconds=interval, hours_range=hours
-                    )
-
-                # Rain chart
-                if rain_data:
-                    chart_paths['rain' + suffix] = self.local_chart_generator.generate_rain_chart(
-                        rain_data, date_str,
-                        interval_seconds=interval, hours_range=hours
-                    )
+        # (chart_key, kind, devices_data, metric, chart_type) for each chart
+        tasks = []
+        if outdoor_data:
+            tasks.append(('outdoor_temp', 'multi', outdoor_data, 'temperature', 'outdoor'))
+            tasks.append(('outdoor_humidity', 'multi', outdoor_data, 'humidity', 'outdoor'))
+        if indoor_data:
+            tasks.append(('indoor_temp', 'multi', indoor_data, 'temperature', 'indoor'))
+            tasks.append(('indoor_humidity', 'multi', indoor_data, 'humidity', 'indoor'))
+            tasks.append(('co2', 'multi', indoor_data, 'co2', 'indoor'))
+        if pressure_data:
+            tasks.append(('pressure', 'multi', pressure_data, 'pressure', 'pressure'))
+        if noise_data:
+            tasks.append(('noise', 'multi', noise_data, 'noise', 'noise'))
+        if wind_data:
+            tasks.append(('wind', 'wind', wind_data, None, None))
+            tasks.append(('wind_direction', 'wind_direction', wind_data, None, None))
+        if rain_data:
+            tasks.append(('rain', 'rain', rain_data, None, None))
+        if light_level_data:
+            tasks.append(('light_level', 'multi', light_level_data, 'light_level', 'light_level'))
+
+        # Render all charts in parallel worker processes, 12h and 24h for each metric
+        futures = {}  # {chart_key: Future}
+        for hours, interval, suffix in [(12, interval_12h, '_12h'), (24, interval_24h, '_24h')]:
+            for chart_key, kind, devices_data, metric, chart_type in tasks:
+                futures[chart_key + suffix] = self._render_pool.submit(
+                    render_chart, kind, devices_data, metric, date_str,
+                    interval_seconds=interval, hours_range=hours, chart_type=chart_type
+                )
 
-                # Light level chart
-                if light_level_data:
-                    chart_paths['light_level' + suffix] = self.local_chart_generator.generate_multi_device_chart(
-                        light_level_data, 'light_level', date_str,
-                        interval_seconds=interval, hours_range=hours, chart_type='light_level'
-                    )
+        # A failed chart is skipped; the rest of the batch is still uploaded
+        chart_paths = {}
+        for chart_key, future in futures.items():
+            try:
+                chart_paths[chart_key] = future.result()
+            except Exception as e:
+                logging.error("Error generating local chart %s: %s", chart_key, e)
 
-                logging.debug("Generated local %dh charts", hours)
+        if futures and not chart_paths:
+            return False
 
-        except Exception as e:
-            logging.error("Error generating local charts: %s", e)
-            return
+        logging.debug("Generated %d/%d local charts", len(chart_paths), len(futures))
 
-        # Post summary text first
         try:
             summary_text = self._build_sensor_summary(outdoor_data, indoor_data, wind_data, rain_data)
-            if summary_text:
-                self.slack_uploader.post_message(summary_text)
-                logging.debug("Posted sensor summary to Slack")
         except Exception as e:
-            logging.error("Error posting summary: %s", e)
+            logging.error("Error building summary: %s", e)
+            summary_text = None
 
-        # Upload charts to Slack
+        # Upload charts to Slack, sharing them with the summary text in one message
         try:
-            results = self.slack_uploader.upload_charts(chart_paths, date_str)
+            results = self.slack_uploader.upload_charts_with_summary(chart_paths, summary_text, date_str)
             success_count = sum(1 for v in results.values() if v)
             total_count = len(results)
             logging.info("Uploaded %d/%d charts to Slack", success_count, total_count)
+            return success_count > 0
         except Exception as e:
             logging.error("Error uploading charts to Slack: %s", e)
             # Cleanup any remaining files
@@ -1352,42 +1755,36 @@ class SwitchBotMonitor:
                         os.remove(path)
                     except Exception:
                         pass
+            return False
+
+    @staticmethod
+    def _format_latest(latest):
+        """Format a device's latest reading as 'a / b / c' (or '-' if empty)."""
+        parts = [
+            fmt.format(latest[key])
+            for key, fmt in SUMMARY_FIELDS
+            if latest.get(key) is not None
+        ]
+        return ' / '.join(parts) if parts else '-'
 
     def _build_sensor_summary(self, outdoor_data, indoor_data, wind_data, rain_data):
         """Build sensor summary text for Slack posting."""
-        from datetime import datetime
+        # rain_data has no summary line, so it alone never produces a report
+        if not (outdoor_data or indoor_data or wind_data):
+            return None
+
         current_time = datetime.now().strftime('%H:%M')
 
-        lines = ['*環境センサーレポート ({})* '.format(current_time)]
+        lines = []
+        append = lines.append
+        append(f'*環境センサーレポート ({current_time})* ')
 
         # Outdoor section
         if outdoor_data:
-            lines.append('*屋外*')
+            append('*屋外*')
             for device_name, data in outdoor_data.items():
                 if data:
-                    latest = data[-1]
-                    temp = latest.get('temperature')
-                    humidity = latest.get('humidity')
-                    co2 = latest.get('co2')
-                    pressure = latest.get('pressure')
-                    noise = latest.get('noise')
-                    wind = latest.get('wind_strength')
-                    gust = latest.get('gust_strength')
-
-                    parts = []
-                    if temp is not None:
-                        parts.append('{}°C'.format(temp))
-                    if humidity is not None:
-                        parts.append('{}%'.format(humidity))
-                    if co2 is not None:
-                        parts.append('{}ppm'.format(co2))
-                    if pressure is not None:
-                        parts.append('{}hPa'.format(pressure))
-                    if noise is not None:
-                        parts.append('{}dB'.format(noise))
-
-                    line = '{}: {}'.format(device_name, ' / '.join(parts) if parts else '-')
-                    lines.append(line)
+                    append(f'{device_name}: {self._format_latest(data[-1])}')
 
         # Wind data (separate because it's a different structure)
         if wind_data:
@@ -1396,58 +1793,52 @@ class SwitchBotMonitor:
                     latest = data[-1]
                     wind_kmh = latest.get('wind_strength')
                     gust_kmh = latest.get('gust_strength')
-                    wind_ms = round(wind_kmh / 3.6, 1) if wind_kmh else None
-                    gust_ms = round(gust_kmh / 3.6, 1) if gust_kmh else None
+                    wind_ms = round(wind_kmh * KMH_TO_MS, 1) if wind_kmh is not None else None
+                    gust_ms = round(gust_kmh * KMH_TO_MS, 1) if gust_kmh is not None else None
 
                     if wind_ms is not None:
-                        line = '{}: {}m/s'.format(device_name, wind_ms)
+                        line = f'{device_name}: {wind_ms}m/s'
                         if gust_ms is not None:
-                            line += ' (突風:{}m/s)'.format(gust_ms)
-                        lines.append(line)
+                            line += f' (突風:{gust_ms}m/s)'
+                        append(line)
 
         # Indoor section
         if indoor_data:
-            lines.append('')
-            lines.append('*屋内*')
+            append('')
+            append('*屋内*')
             for device_name, data in indoor_data.items():
                 if data:
-                    latest = data[-1]
-                    temp = latest.get('temperature')
-                    humidity = latest.get('humidity')
-                    co2 = latest.get('co2')
-                    pressure = latest.get('pressure')
-                    noise = latest.get('noise')
-
-                    parts = []
-                    if temp is not None:
-                        parts.append('{}°C'.format(temp))
-                    if humidity is not None:
-                        parts.append('{}%'.format(humidity))
-                    if co2 is not None:
-                        parts.append('{}ppm'.format(co2))
-                    if pressure is not None:
-                        parts.append('{}hPa'.format(pressure))
-                    if noise is not None:
-                        parts.append('{}dB'.format(noise))
-
-                    line = '{}: {}'.format(device_name, ' / '.join(parts) if parts else '-')
-                    lines.append(line)
+                    append(f'{device_name}: {self._format_latest(data[-1])}')
 
         return '\n'.join(lines) if len(lines) > 1 else None
 
-    def check_graph_report(self):
-        """Check if it's time to send graph report (every N minutes)."""
-        report_config = self.config.get('graph_report', {})
-        if not report_config.get('enabled', False):
-            return
+    def _poll_devices_task(self):
+        """Scheduled SwitchBot poll (skipped while the network is down)."""
+        if self.network_checker.is_healthy():
+            self.poll_devices()
+        else:
+            logging.warning("ネットワーク不通のためSwitchBotポーリングをスキップ")
+
+    def _poll_netatmo_task(self):
+        """Scheduled Netatmo poll (skipped while the network is down)."""
+        self.last_netatmo_poll = time.monotonic()
+        if self.network_checker.is_healthy():
+            self.poll_netatmo()
+        else:
+            logging.warning("ネットワーク不通のためNetatmoポーリングをスキップ")
 
-        interval_minutes = report_config.get('interval_minutes', 5)
-        interval_seconds = interval_minutes * 60
+    def _poll_nest_task(self):
+        """Scheduled Google Nest poll (skipped while the network is down)."""
+        self.last_nest_poll = time.monotonic()
+        if self.network_checker.is_healthy():
+            self.poll_nest()
+        else:
+            logging.warning("ネットワーク不通のためGoogle Nestポーリングをスキップ")
 
-        now = time.time()
-        if now - self.last_graph_report >= interval_seconds:
-            self.send_graph_report()
-            self.last_graph_report = now
+    def _graph_report_task(self):
+        """Scheduled graph report (every N minutes)."""
+        self.last_graph_report = time.monotonic()
+        self.send_graph_report()
 
     def check_garbage_notification(self):
         """
@@ -1458,12 +1849,18 @@ class SwitchBotMonitor:
         if not self.garbage_notifier.enabled:
             return
 
-        now = datetime.now()
-        today = now.date()
-
         evening_hour = self.garbage_notifier.evening_hour
         morning_hour = self.garbage_notifier.morning_hour
 
+        # Cheap check first: notifications only go out in the first 5 minutes
+        # of the configured hours, so skip building dates the rest of the time
+        local_now = time.localtime()
+        if local_now.tm_min >= 5 or local_now.tm_hour not in (evening_hour, morning_hour):
+            return
+
+        now = datetime.now()
+        today = now.date()
+
         # Check evening notification - about tomorrow
         if now.hour == evening_hour and now.minute < 5:
             if self.last_garbage_notification['evening'] != today:
@@ -1478,13 +1875,44 @@ class SwitchBotMonitor:
                 if self.garbage_notifier.send_notification(is_tomorrow=False):
                     self.last_garbage_notification['morning'] = today
 
+    def cleanup_old_data(self):
+        """Delete history and time series rows older than the configured retention."""
+        # Cleanup old history
+        history_days = self.database_cfg.history_days
+        if history_days > 0:
+            deleted = self.db.cleanup_old_history(history_days)
+            if deleted > 0:
+                logging.info("Cleaned up %d old history records", deleted)
+
+        # Cleanup old sensor data (SwitchBot)
+        sensor_days = self.database_cfg.sensor_data_days
+        if sensor_days > 0:
+            deleted = self.db.cleanup_old_sensor_data(sensor_days)
+            if deleted > 0:
+                logging.info("Cleaned up %d old SwitchBot sensor data records", deleted)
+
+        # Cleanup old Netatmo data
+        netatmo_days = self.database_cfg.netatmo_data_days
+        if netatmo_days > 0:
+            deleted = self.db.cleanup_old_netatmo_data(netatmo_days)
+            if deleted > 0:
+                logging.info("Cleaned up %d old Netatmo data records", deleted)
+
     def run(self):
         """Main monitoring loop."""
-        global running
-
         # Build device map
         logging.info("Fetching device list...")
         self.device_map = build_device_map(self.api, self.config)
+        self.mac_index = build_mac_index(self.device_map)
+        self.polling_devices = tuple(
+            info for info in self.device_map.values()
+            if info['category'] == 'polling'
+        )
+        self.sensor_devices = tuple(sorted(
+            (info for info in self.device_map.values()
+             if self._is_sensor_device(info['device_type'])),
+            key=lambda info: info['device_name']
+        ))
 
         # Count devices by category
         counts = {'ignore': 0, 'polling': 0, 'webhook': 0}
@@ -1496,6 +1924,15 @@ class SwitchBotMonitor:
             len(self.device_map), counts['polling'], counts['webhook'], counts['ignore']
         )
 
+        # Initial polls run concurrently (with each other and with server/tunnel setup)
+        startup_executor = ThreadPoolExecutor(max_workers=3)
+        initial_polls = [startup_executor.submit(self.poll_devices)]
+        if self.netatmo_api:
+            initial_polls.append(startup_executor.submit(self.poll_netatmo))
+        if self.nest_api:
+            initial_polls.append(startup_executor.submit(self.poll_nest))
+        startup_executor.shutdown(wait=False)
+
         # Setup dashboard server
         self.setup_dashboard_server()
 
@@ -1510,39 +1947,38 @@ class SwitchBotMonitor:
             self.register_webhook()
 
         # Send startup notification
-        if self.config.get('slack', {}).get('notify_startup', True):
+        if self.slack_cfg.notify_startup:
             self.slack.notify_startup(counts['polling'] + counts['webhook'])
 
         # Get polling interval
-        interval = self.config.get('monitor', {}).get('interval_seconds', 1800)
+        interval = self.monitor_cfg.interval_seconds
         logging.info("SwitchBot polling interval: %d seconds", interval)
 
         # Get Netatmo polling interval (default: 10 minutes)
-        netatmo_interval = self.config.get('netatmo', {}).get('interval_seconds', 600)
+        netatmo_interval = self.netatmo_cfg.interval_seconds
         if self.netatmo_api:
             logging.info("Netatmo polling interval: %d seconds", netatmo_interval)
 
         # Get Google Nest polling interval (default: 5 minutes)
-        nest_interval = self.config.get('google_nest', {}).get('interval_seconds', 300)
+        nest_interval = self.nest_cfg.interval_seconds
         if self.nest_api:
             logging.info("Google Nest polling interval: %d seconds", nest_interval)
 
         # Get graph report interval
-        graph_interval = self.config.get('graph_report', {}).get('interval_minutes', 5)
-        logging.info("Graph report interval: %d minutes", graph_interval)
+        logging.info("Graph report interval: %d minutes", self.graph_cfg.interval_seconds // 60)
 
-        # Initial poll
-        self.poll_devices()
+        # Wait for initial polls
+        for future in initial_polls:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error("Error in initial poll: %s", e)
 
-        # Initial Netatmo poll
         if self.netatmo_api:
-            self.poll_netatmo()
-            self.last_netatmo_poll = time.time()
+            self.last_netatmo_poll = time.monotonic()
 
-        # Initial Google Nest poll
         if self.nest_api:
-            self.poll_nest()
-            self.last_nest_poll = time.time()
+            self.last_nest_poll = time.monotonic()
 
             # Start Pub/Sub client for real-time events
             if self.nest_pubsub:
@@ -1554,60 +1990,70 @@ class SwitchBotMonitor:
                 self.nest_pubsub.set_device_names(device_names)
 
                 # Start Pub/Sub long polling
-                pubsub_config = self.config.get('google_nest', {}).get('pubsub', {})
-                poll_timeout = pubsub_config.get('poll_timeout_seconds', 60)
+                poll_timeout = self.nest_cfg.poll_timeout_seconds
                 self.nest_pubsub.start(poll_timeout=poll_timeout)
                 logging.info("Google Nest Pub/Sub client started (timeout=%ds)", poll_timeout)
 
-        # Send initial graph report immediately after first poll
-        if self.config.get('graph_report', {}).get('enabled', False):
-            logging.info("Sending initial graph report...")
-            self.send_graph_report()
-
         # Initialize graph report timer
-        self.last_graph_report = time.time()
-
-        # Main loop
-        last_poll = time.time()
-        while running:
-            now = time.time()
-
-            # Check if it's time to poll SwitchBot
-            if now - last_poll >= interval:
-                if self.network_checker.is_healthy():
-                    self.poll_devices()
-                else:
-                    logging.warning("ネットワーク不通のためSwitchBotポーリングをスキップ")
-                last_poll = now
-
-            # Check if it's time to poll Netatmo
-            if self.netatmo_api and now - self.last_netatmo_poll >= netatmo_interval:
-                if self.network_checker.is_healthy():
-                    self.poll_netatmo()
-                else:
-                    logging.warning("ネットワーク不通のためNetatmoポーリングをスキップ")
-                self.last_netatmo_poll = now
-
-            # Check if it's time to poll Google Nest
-            if self.nest_api and now - self.last_nest_poll >= nest_interval:
-                if self.network_checker.is_healthy():
-                    self.poll_nest()
-                else:
-                    logging.warning("ネットワーク不通のためGoogle Nestポーリングをスキップ")
-                self.last_nest_poll = now
-
-            # Check for graph report (every 5 minutes)
-            self.check_graph_report()
-
-            # Check for garbage collection notification (20:00 and 6:00)
-            self.check_garbage_notification()
-
-            # Sleep briefly
-            time.sleep(1)
+        self.last_graph_report = time.monotonic()
+
+        # Scheduled tasks: heap of (next_due, name, interval, callback)
+        now = time.monotonic()
+        schedule = [
+            (now + interval, 'switchbot', interval, self._poll_devices_task),
+            (now, 'garbage', GARBAGE_CHECK_INTERVAL_SECONDS, self.check_garbage_notification),
+            (now, 'db_cleanup', DATABASE_CLEANUP_INTERVAL_SECONDS, self.cleanup_old_data),
+        ]
+        if self.netatmo_api:
+            schedule.append((self.last_netatmo_poll + netatmo_interval, 'netatmo',
+                             netatmo_interval, self._poll_netatmo_task))
+        if self.nest_api:
+            schedule.append((self.last_nest_poll + nest_interval, 'nest',
+                             nest_interval, self._poll_nest_task))
+        if self.graph_cfg.enabled:
+            schedule.append((self.last_graph_report + self.graph_cfg.interval_seconds, 'graph_report',
+                             self.graph_cfg.interval_seconds, self._graph_report_task))
+        heapq.heapify(schedule)
+
+        # Tasks run on worker threads so a slow poll (e.g. Netatmo) does not delay
+        # the others; a task still running from its previous slot is skipped
+        task_executor = ThreadPoolExecutor(max_workers=len(schedule), thread_name_prefix='task')
+        running = {}  # {task name: Future}
+
+        # Send initial graph report right after the first poll, in the background
+        # so the polling loop starts immediately
+        if self.graph_cfg.enabled:
+            logging.info("Sending initial graph report...")
+            running['graph_report'] = task_executor.submit(
+                self._run_scheduled_task, 'graph_report', self.send_graph_report
+            )
 
-        # Cleanup
+        # Main loop: sleep until the next task is due (returns early on shutdown signal)
+        while not stop_event.is_set():
+            next_due, name, task_interval, callback = schedule[0]
+            now = time.monotonic()
+            if next_due > now:
+                stop_event.wait(next_due - now)
+                continue
+
+            heapq.heapreplace(schedule, (now + task_interval, name, task_interval, callback))
+            previous = running.get(name)
+            if previous and not previous.done():
+                logging.warning("Scheduled task %s still running, skipping this run", name)
+                continue
+            running[name] = task_executor.submit(self._run_scheduled_task, name, callback)
+
+        # Cleanup (wait for in-flight tasks before closing clients)
+        task_executor.shutdown(wait=True)
         self.shutdown()
 
+    def _run_scheduled_task(self, name, callback):
+        """Run one scheduled task on a worker thread, logging any error."""
+        try:
+            callback()
+        except Exception as e:
+            logging.error("Error in scheduled task %s: %s", name, e)
+
     def shutdown(self):
         """Clean shutdown."""
         logging.info("Shutting down...")
@@ -1616,38 +2062,41 @@ class SwitchBotMonitor:
         if self.nest_pubsub:
             self.nest_pubsub.stop()
 
+        # Stop Netatmo background token refresher
+        if self.netatmo_api:
+            self.netatmo_api.stop_refresher()
+
         # Stop dashboard server
         if self.dashboard_server:
             self.dashboard_server.stop()
 
+        # Stop status poll workers
+        self._poll_executor.shutdown(wait=False)
+
+        # Stop chart render workers
+        if self._render_pool:
+            self._render_pool.shutdown(wait=False)
+
         # Stop webhook server
         if self.webhook_server:
             self.webhook_server.stop()
 
+        # Let the event worker finish queued events, then stop it
+        if self._event_worker:
+            try:
+                self._event_q.put(None, timeout=5)
+            except queue.Full:
+                pass
+            self._event_worker.join(timeout=10)
+
         # Stop tunnel
         if self.tunnel:
             self.tunnel.stop()
 
-        # Cleanup old history
-        history_days = self.config.get('database', {}).get('history_days', 30)
-        if history_days > 0:
-            deleted = self.db.cleanup_old_history(history_days)
-            if deleted > 0:
-                logging.info("Cleaned up %d old history records", deleted)
-
-        # Cleanup old sensor data (SwitchBot)
-        sensor_days = self.config.get('database', {}).get('sensor_data_days', 7)
-        if sensor_days > 0:
-            deleted = self.db.cleanup_old_sensor_data(sensor_days)
-            if deleted > 0:
-                logging.info("Cleaned up %d old SwitchBot sensor data records", deleted)
-
-        # Cleanup old Netatmo data
-        netatmo_days = self.config.get('database', {}).get('netatmo_data_days', 7)
-        if netatmo_days > 0:
-            deleted = self.db.cleanup_old_netatmo_data(netatmo_days)
-            if deleted > 0:
-                logging.info("Cleaned up %d old Netatmo data records", deleted)
+        # Close the shared HTTP session and every thread's DB connection
+        # (task threads and the event worker have finished by now)
+        self.http_session.close()
+        self.db.close()
 
         logging.info("Shutdown complete")
 
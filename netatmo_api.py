@@ -8,17 +8,43 @@ Reference: https://dev.netatmo.com/apidocumentation/oauth
 """
 import json
 import os
+import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+import json_utils
+from network_resilience import create_http_session
+
+# Optional: stream-parse large /getmeasure responses (pip install ijson)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+def _log_request_error(message, exc):
+    """Log a failed request and, if there is one, the error response body."""
+    logging.error("%s: %s", message, exc)
+    response = getattr(exc, 'response', None)
+    if response is not None:
+        logging.error("Response: %s", response.text)
+
+
+# Concurrent /getmeasure requests in get_measures_bulk (shares the session's pool)
+MEASURE_WORKERS = 4
+
 
 class NetatmoAPI:
     """Netatmo Weather Station API client with OAuth2 authentication."""
 
     AUTH_URL = "https://api.netatmo.com/oauth2/token"
     API_BASE = "https://api.netatmo.com/api"
+    STATIONS_URL = API_BASE + "/getstationsdata"
+    MEASURE_URL = API_BASE + "/getmeasure"
 
     # Module types
     MODULE_TYPES = {
@@ -30,10 +56,58 @@ class NetatmoAPI:
     }
 
     # Outdoor module types (for is_outdoor flag)
-    OUTDOOR_MODULE_TYPES = ['NAModule1', 'NAModule2', 'NAModule3']
+    OUTDOOR_MODULE_TYPES = frozenset(['NAModule1', 'NAModule2', 'NAModule3'])
+
+    # Standardized readings with every field unset, copied per station/module.
+    # Each holds only the fields that device class can report.
+    STATION_READING = dict.fromkeys((
+        'device_id', 'device_name', 'station_name', 'module_type', 'is_outdoor',
+        'temperature', 'humidity', 'co2', 'pressure', 'noise',
+        'wifi_status', 'time_utc'
+    ))
+    MODULE_READING = dict.fromkeys((
+        'device_id', 'device_name', 'station_name', 'module_type', 'is_outdoor',
+        'temperature', 'humidity', 'co2',
+        'wind_strength', 'wind_angle', 'gust_strength', 'gust_angle',
+        'rain', 'rain_1h', 'rain_24h',
+        'battery_percent', 'rf_status', 'time_utc'
+    ))
+
+    # dashboard_data fields: (reading key, Netatmo key)
+    STATION_DASHBOARD_FIELDS = (
+        ('temperature', 'Temperature'),
+        ('humidity', 'Humidity'),
+        ('co2', 'CO2'),
+        ('pressure', 'Pressure'),
+        ('noise', 'Noise'),
+        ('time_utc', 'time_utc'),
+    )
+    # Only the main station has pressure and noise
+    MODULE_DASHBOARD_FIELDS = (
+        ('temperature', 'Temperature'),
+        ('humidity', 'Humidity'),
+        ('co2', 'CO2'),
+        # Wind data (NAModule2)
+        ('wind_strength', 'WindStrength'),
+        ('wind_angle', 'WindAngle'),
+        ('gust_strength', 'GustStrength'),
+        ('gust_angle', 'GustAngle'),
+        # Rain data (NAModule3)
+        ('rain', 'Rain'),
+        ('rain_1h', 'sum_rain_1'),
+        ('rain_24h', 'sum_rain_24'),
+        ('time_utc', 'time_utc'),
+    )
+
+    # Station dashboards only change every ~5 minutes; repeat polls within this
+    # many seconds reuse the last /getstationsdata response
+    STATIONS_CACHE_TTL = 60
+
+    # Background refresher renews the access token this long before it expires
+    TOKEN_REFRESH_AHEAD_SECONDS = 600
 
     def __init__(self, client_id, client_secret, refresh_token, credentials_file=None,
-                 network_checker=None):
+                 network_checker=None, session=None):
         """
         Initialize Netatmo API client.
 
@@ -43,6 +117,7 @@ class NetatmoAPI:
             refresh_token: OAuth2 refresh token
             credentials_file: Optional file path to persist updated refresh token
             network_checker: Optional NetworkHealthChecker instance
+            session: Optional shared requests.Session
         """
         self.client_id = client_id
         self.client_secret = client_secret
@@ -51,12 +126,75 @@ class NetatmoAPI:
         self.network_checker = network_checker
 
         self.access_token = None
-        self.token_expires_at = 0
+        self.token_expires_at = 0  # time.monotonic() deadline (immune to wall-clock jumps)
+        self._auth_headers = None  # Rebuilt only when the token changes
+
+        # Last /getstationsdata body (all stations) and when it was fetched
+        self.stations_ttl = self.STATIONS_CACHE_TTL
+        self._stations_cache = None
+        self._stations_cache_at = 0.0
+
+        # Serializes token refreshes between poll threads and the background refresher
+        self._token_lock = threading.Lock()
+        self._refresher_stop = threading.Event()
+        self._refresher_thread = None
+
+        # Persistent keep-alive session for token refresh and API calls
+        # (shared with the other clients when passed in)
+        self.session = session or create_http_session()
+        self._owns_session = session is None
+
+    def close(self):
+        """Close the underlying HTTP session (unless it is shared)."""
+        self.stop_refresher()
+        if self._owns_session:
+            self.session.close()
+
+    def start_refresher(self):
+        """
+        Start refreshing the access token in a background thread before it expires,
+        so API requests do not wait on the OAuth round-trip.
+        _ensure_valid_token still refreshes inline if the token runs out anyway.
+        """
+        if self._refresher_thread:
+            return
+
+        self._refresher_stop.clear()
+        self._refresher_thread = threading.Thread(
+            target=self._refresh_loop,
+            daemon=True,
+            name="NetatmoTokenRefresher"
+        )
+        self._refresher_thread.start()
+
+    def stop_refresher(self):
+        """Stop the background token refresher."""
+        if not self._refresher_thread:
+            return
+
+        self._refresher_stop.set()
+        self._refresher_thread.join(timeout=5)
+        self._refresher_thread = None
+
+    def _refresh_loop(self):
+        """Background loop: renew the token TOKEN_REFRESH_AHEAD_SECONDS before expiry."""
+        while True:
+            wait = max(60, self.token_expires_at - time.monotonic() - self.TOKEN_REFRESH_AHEAD_SECONDS)
+            if self._refresher_stop.wait(wait):
+                break
+
+            if self.network_checker and not self.network_checker.is_healthy():
+                continue
+
+            try:
+                self._ensure_valid_token(self.TOKEN_REFRESH_AHEAD_SECONDS)
+            except Exception as e:
+                logging.warning("Background Netatmo token refresh failed: %s", e)
 
     def _refresh_access_token(self):
         """
         Refresh the access token using the refresh token.
-        Updates self.access_token and self.token_expires_at.
+        Updates self.access_token, self.token_expires_at and the cached auth headers.
         Optionally persists new refresh_token to credentials file.
         """
         payload = {
@@ -71,18 +209,24 @@ class NetatmoAPI:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.AUTH_URL,
                 data=payload,
                 headers=headers,
                 timeout=(5, 25)
             )
             response.raise_for_status()
-            data = response.json()
+            data = json_utils.loads(response.content)
 
             self.access_token = data['access_token']
             expires_in = data.get('expires_in', 10800)  # Default 3 hours
-            self.token_expires_at = time.time() + expires_in - 300  # 5 min buffer
+            self.token_expires_at = time.monotonic() + expires_in - 300  # 5 min buffer
+            self._auth_headers = {
+                'Accept': 'application/json',
+                # Station/measure JSON is highly repetitive; explicit in case session defaults change
+                'Accept-Encoding': 'gzip, deflate',
+                'Authorization': 'Bearer {}'.format(self.access_token)
+            }
 
             # Update refresh token if a new one is provided
             if 'refresh_token' in data and data['refresh_token'] != self.refresh_token:
@@ -97,9 +241,7 @@ class NetatmoAPI:
             return True
 
         except requests.exceptions.RequestException as e:
-            logging.error("Failed to refresh Netatmo access token: %s", e)
-            if hasattr(e, 'response') and e.response is not None:
-                logging.error("Response: %s", e.response.text)
+            _log_request_error("Failed to refresh Netatmo access token", e)
             raise
 
     def _save_credentials(self):
@@ -113,16 +255,25 @@ class NetatmoAPI:
                 'client_secret': self.client_secret,
                 'refresh_token': self.refresh_token
             }
-            with open(self.credentials_file, 'w') as f:
-                json.dump(credentials, f, indent=2)
+            json_utils.dump_file_atomic(credentials, self.credentials_file)
             logging.debug("Netatmo credentials saved to %s", self.credentials_file)
         except Exception as e:
             logging.warning("Failed to save Netatmo credentials: %s", e)
 
-    def _ensure_valid_token(self):
-        """Ensure we have a valid access token, refreshing if needed."""
-        if not self.access_token or time.time() >= self.token_expires_at:
-            self._refresh_access_token()
+    def _ensure_valid_token(self, margin=0):
+        """
+        Ensure we have a valid access token, refreshing if needed.
+
+        Args:
+            margin: Also refresh if the token expires within this many seconds
+        """
+        if self.access_token and time.monotonic() < self.token_expires_at - margin:
+            return
+
+        with self._token_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not self.access_token or time.monotonic() >= self.token_expires_at - margin:
+                self._refresh_access_token()
 
     def _api_request(self, endpoint, params=None):
         """
@@ -135,50 +286,83 @@ class NetatmoAPI:
         Returns:
             dict: Response body
         """
+        return self._api_get_json(self.API_BASE + endpoint, params)
+
+    def _api_get_json(self, url, params=None):
+        """
+        Make an authenticated API request to a full URL (e.g. STATIONS_URL).
+
+        Returns:
+            dict: Response body
+        """
+        response = self._api_get(url, params)
+        logging.debug("Netatmo %s: %d bytes (Content-Encoding: %s)", url,
+                      len(response.content), response.headers.get('Content-Encoding', 'identity'))
+        return json_utils.loads(response.content)
+
+    def _api_get(self, url, params=None, stream=False):
+        """
+        Send an authenticated GET request.
+
+        Args:
+            url: Full API URL (e.g., STATIONS_URL)
+            params: Optional query parameters
+            stream: Leave the body unread (caller consumes response.raw)
+
+        Returns:
+            requests.Response: Successful response
+        """
         # Network health check
         if self.network_checker and not self.network_checker.is_healthy():
             raise requests.exceptions.ConnectionError("ネットワーク不通のためリクエストをスキップ")
 
         self._ensure_valid_token()
 
-        url = self.API_BASE + endpoint
-        headers = {
-            'Accept': 'application/json',
-            'Authorization': 'Bearer {}'.format(self.access_token)
-        }
-
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=headers,
+                headers=self._auth_headers,
                 params=params,
-                timeout=(5, 25)
+                timeout=(5, 60) if stream else (5, 25),
+                stream=stream
             )
             response.raise_for_status()
-            return response.json()
+            return response
 
         except requests.exceptions.RequestException as e:
-            logging.error("Netatmo API request failed: %s", e)
-            if hasattr(e, 'response') and e.response is not None:
-                logging.error("Response: %s", e.response.text)
+            _log_request_error("Netatmo API request failed", e)
             raise
 
     def get_stations_data(self, device_id=None):
         """
         Get weather station data.
 
+        All-station responses are cached for stations_ttl seconds.
+
         Args:
             device_id: Optional specific device MAC address
 
         Returns:
             dict: Station data with devices and modules
         """
+        cache_fresh = time.monotonic() - self._stations_cache_at < self.stations_ttl
+        if not device_id and self._stations_cache is not None and cache_fresh:
+            return self._stations_cache
+
         params = {}
         if device_id:
             params['device_id'] = device_id
 
-        response = self._api_request('/getstationsdata', params)
-        return response.get('body', {})
+        response = self._api_get_json(self.STATIONS_URL, params)
+        body = response.get('body', {})
+        if not device_id:
+            self._stations_cache = body
+            self._stations_cache_at = time.monotonic()
+        return body
+
+    def invalidate_stations_cache(self):
+        """Force the next get_stations_data() call to hit the API."""
+        self._stations_cache = None
 
     def get_all_sensor_readings(self):
         """
@@ -208,81 +392,72 @@ class NetatmoAPI:
                       'rf_status': int or None,
                       'time_utc': int (unix timestamp)
                   }]
+                  Fields a device class cannot report are left out: the main
+                  station has no wind/rain/battery_percent/rf_status keys, and
+                  modules have no pressure/noise/wifi_status keys. Use .get().
         """
         data = self.get_stations_data()
         devices = data.get('devices', [])
         readings = []
+        append = readings.append
+        station_reading = self.STATION_READING
+        module_reading = self.MODULE_READING
+        station_fields = self.STATION_DASHBOARD_FIELDS
+        module_fields = self.MODULE_DASHBOARD_FIELDS
+        outdoor_types = self.OUTDOOR_MODULE_TYPES
 
         for device in devices:
+            device_get = device.get
+
             # Main station (indoor)
-            station_name = device.get('station_name', device.get('home_name', 'Unknown'))
-            module_name = device.get('module_name', station_name)
+            station_name = device_get('station_name', device_get('home_name', 'Unknown'))
+            module_name = device_get('module_name', station_name)
 
             # Get dashboard data (current readings)
-            dashboard = device.get('dashboard_data', {})
+            dashboard = device_get('dashboard_data', {})
 
             if dashboard:
-                reading = {
-                    'device_id': device.get('_id'),
-                    'device_name': module_name,
-                    'station_name': station_name,
-                    'module_type': device.get('type', 'NAMain'),
-                    'is_outdoor': False,  # Main station is always indoor
-                    'temperature': dashboard.get('Temperature'),
-                    'humidity': dashboard.get('Humidity'),
-                    'co2': dashboard.get('CO2'),
-                    'pressure': dashboard.get('Pressure'),
-                    'noise': dashboard.get('Noise'),
-                    'wind_strength': None,
-                    'wind_angle': None,
-                    'gust_strength': None,
-                    'gust_angle': None,
-                    'rain': None,
-                    'rain_1h': None,
-                    'rain_24h': None,
-                    'battery_percent': None,  # Main station has no battery
-                    'wifi_status': device.get('wifi_status'),
-                    'rf_status': None,
-                    'time_utc': dashboard.get('time_utc')
-                }
-                readings.append(reading)
+                reading = station_reading.copy()
+                reading['device_id'] = device_get('_id')
+                reading['device_name'] = module_name
+                reading['station_name'] = station_name
+                reading['module_type'] = device_get('type', 'NAMain')
+                reading['is_outdoor'] = False  # Main station is always indoor
+                # Main station is mains-powered (no battery) and reports Wi-Fi signal
+                reading['wifi_status'] = device_get('wifi_status')
+
+                dashboard_get = dashboard.get
+                for key, source in station_fields:
+                    value = dashboard_get(source)
+                    if value is not None:
+                        reading[key] = value
+                append(reading)
 
             # Process modules (outdoor, additional indoor, rain, wind)
-            modules = device.get('modules', [])
+            modules = device_get('modules', [])
             for module in modules:
                 module_dashboard = module.get('dashboard_data', {})
                 if not module_dashboard:
                     continue
 
-                module_type = module.get('type', '')
-                is_outdoor = module_type in self.OUTDOOR_MODULE_TYPES
-
-                reading = {
-                    'device_id': module.get('_id'),
-                    'device_name': module.get('module_name', 'Module'),
-                    'station_name': station_name,
-                    'module_type': module_type,
-                    'is_outdoor': is_outdoor,
-                    'temperature': module_dashboard.get('Temperature'),
-                    'humidity': module_dashboard.get('Humidity'),
-                    'co2': module_dashboard.get('CO2'),
-                    'pressure': None,  # Only main station has pressure
-                    'noise': None,     # Only main station has noise
-                    # Wind data (NAModule2)
-                    'wind_strength': module_dashboard.get('WindStrength'),
-                    'wind_angle': module_dashboard.get('WindAngle'),
-                    'gust_strength': module_dashboard.get('GustStrength'),
-                    'gust_angle': module_dashboard.get('GustAngle'),
-                    # Rain data (NAModule3)
-                    'rain': module_dashboard.get('Rain'),
-                    'rain_1h': module_dashboard.get('sum_rain_1'),
-                    'rain_24h': module_dashboard.get('sum_rain_24'),
-                    'battery_percent': module.get('battery_percent'),
-                    'wifi_status': None,
-                    'rf_status': module.get('rf_status'),
-                    'time_utc': module_dashboard.get('time_utc')
-                }
-                readings.append(reading)
+                module_get = module.get
+                module_type = module_get('type', '')
+
+                reading = module_reading.copy()
+                reading['device_id'] = module_get('_id')
+                reading['device_name'] = module_get('module_name', 'Module')
+                reading['station_name'] = station_name
+                reading['module_type'] = module_type
+                reading['is_outdoor'] = module_type in outdoor_types
+                reading['battery_percent'] = module_get('battery_percent')
+                reading['rf_status'] = module_get('rf_status')
+
+                dashboard_get = module_dashboard.get
+                for key, source in module_fields:
+                    value = dashboard_get(source)
+                    if value is not None:
+                        reading[key] = value
+                append(reading)
 
         return readings
 
@@ -306,26 +481,125 @@ class NetatmoAPI:
         Returns:
             dict: Measurement data
         """
+        # requests leaves out parameters whose value is None
         params = {
             'device_id': device_id,
+            'module_id': module_id,
             'scale': scale,
             'type': data_type,
+            'date_begin': date_begin,
+            'date_end': date_end,
+            'limit': limit,
             'optimize': 'true' if optimize else 'false',
             'real_time': 'true' if real_time else 'false'
         }
 
-        if module_id:
-            params['module_id'] = module_id
-        if date_begin:
-            params['date_begin'] = date_begin
-        if date_end:
-            params['date_end'] = date_end
-        if limit:
-            params['limit'] = limit
-
-        response = self._api_request('/getmeasure', params)
+        response = self._api_get_json(self.MEASURE_URL, params)
         return response.get('body', {})
 
+    def iter_measure(self, device_id, module_id=None, scale='30min', data_type='Temperature,Humidity',
+                     date_begin=None, date_end=None, limit=None, real_time=False):
+        """
+        Iterate over historical measurements without loading the whole response.
+
+        With ijson installed the body is parsed incrementally from the socket,
+        so memory stays constant however wide the date range is. Without it,
+        this falls back to get_measure().
+
+        Args:
+            Same as get_measure (the response is never optimized)
+
+        Yields:
+            tuple: (timestamp str, [values in data_type order])
+        """
+        if not IJSON_AVAILABLE:
+            body = self.get_measure(device_id, module_id, scale, data_type,
+                                    date_begin, date_end, limit, real_time=real_time)
+            for item in body.items():
+                yield item
+            return
+
+        params = {
+            'device_id': device_id,
+            'module_id': module_id,
+            'scale': scale,
+            'type': data_type,
+            'date_begin': date_begin,
+            'date_end': date_end,
+            'limit': limit,
+            'optimize': 'false',
+            'real_time': 'true' if real_time else 'false'
+        }
+        response = self._api_get(self.MEASURE_URL, params, stream=True)
+        try:
+            # Let urllib3 undo gzip/deflate before ijson reads the raw stream
+            response.raw.decode_content = True
+            for item in ijson.kvitems(response.raw, 'body', use_float=True):
+                yield item
+        finally:
+            response.close()
+
+    def get_measures_bulk(self, queries):
+        """
+        Run several get_measure queries with as few requests as possible.
+
+        Queries that differ only in data_type are merged into one /getmeasure
+        request with a combined type list, and the remaining requests run
+        concurrently over the keep-alive session's connection pool.
+
+        Args:
+            queries: List of dicts of get_measure keyword arguments
+                     (device_id is required)
+
+        Returns:
+            list: Measurement data per query, in the original order. Each
+                  result holds only the columns of that query's data_type.
+        """
+        groups = {}  # {request key: [data types]}
+        query_keys = []
+        for query in queries:
+            query = dict(query)
+            types = [t.strip() for t in query.pop('data_type', 'Temperature,Humidity').split(',')]
+            key = tuple(sorted(query.items()))
+            group_types = groups.setdefault(key, [])
+            group_types.extend(t for t in types if t not in group_types)
+            query_keys.append((key, types))
+
+        if not groups:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(MEASURE_WORKERS, len(groups))) as executor:
+            futures = {
+                key: executor.submit(self.get_measure, data_type=','.join(types), **dict(key))
+                for key, types in groups.items()
+            }
+            bodies = {key: future.result() for key, future in futures.items()}
+
+        results = []
+        for key, types in query_keys:
+            group_types = groups[key]
+            columns = [group_types.index(t) for t in types]
+            results.append(self._select_measure_columns(bodies[key], columns))
+        return results
+
+    @staticmethod
+    def _select_measure_columns(body, columns):
+        """
+        Pick value columns out of a /getmeasure body.
+
+        Handles both response shapes: {timestamp: [values]} (optimize=False)
+        and [{'beg_time', 'step_time', 'value': [[values]]}] (optimize=True).
+        """
+        if isinstance(body, dict):
+            return {
+                timestamp: [values[i] for i in columns]
+                for timestamp, values in body.items()
+            }
+        return [
+            dict(block, value=[[values[i] for i in columns] for values in block.get('value', [])])
+            for block in body
+        ]
+
 
 def load_credentials_from_file(filepath):
     """
@@ -337,8 +611,8 @@ def load_credentials_from_file(filepath):
     Returns:
         dict: Credentials with client_id, client_secret, refresh_token
     """
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        return json_utils.loads(f.read())
 
 
 if __name__ == '__main__':
@@ -364,15 +638,15 @@ if __name__ == '__main__':
                 reading['module_type'],
                 'Outdoor' if reading['is_outdoor'] else 'Indoor'
             ))
-            if reading['temperature'] is not None:
+            if reading.get('temperature') is not None:
                 print("  Temperature: {}°C".format(reading['temperature']))
-            if reading['humidity'] is not None:
+            if reading.get('humidity') is not None:
                 print("  Humidity: {}%".format(reading['humidity']))
-            if reading['co2'] is not None:
+            if reading.get('co2') is not None:
                 print("  CO2: {} ppm".format(reading['co2']))
-            if reading['pressure'] is not None:
+            if reading.get('pressure') is not None:
                 print("  Pressure: {} mbar".format(reading['pressure']))
-            if reading['noise'] is not None:
+            if reading.get('noise') is not None:
                 print("  Noise: {} dB".format(reading['noise']))
     else:
         print("Usage: python netatmo_api.py <credentials_file.json>")
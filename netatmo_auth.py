@@ -16,20 +16,26 @@ Netatmo OAuth2 Authorization Helper
 参考: https://dev.netatmo.com/apidocumentation/oauth
 """
 import sys
+import html
 import json
 import webbrowser
 import http.server
-import socketserver
 import threading
+import time
 import urllib.parse
 import requests
 
+import json_utils
+
 
 # ローカルサーバーでコールバックを受け取るためのポート
 CALLBACK_PORT = 9876
 CALLBACK_PATH = "/callback"
 REDIRECT_URI = "http://localhost:{port}{path}".format(port=CALLBACK_PORT, path=CALLBACK_PATH)
 
+# コールバック待機の上限（秒）
+CALLBACK_TIMEOUT_SECONDS = 300
+
 # Netatmo OAuth2 エンドポイント
 AUTH_URL = "https://api.netatmo.com/oauth2/authorize"
 TOKEN_URL = "https://api.netatmo.com/oauth2/token"
@@ -37,6 +43,28 @@ TOKEN_URL = "https://api.netatmo.com/oauth2/token"
 # 取得するスコープ（Weather Station読み取り権限）
 SCOPES = "read_station"
 
+# コールバック応答ページ（起動時に一度だけエンコード）
+SUCCESS_HTML = """
+<html>
+<head><title>認証成功</title></head>
+<body style="font-family: sans-serif; text-align: center; padding-top: 50px;">
+    <h1 style="color: green;">認証成功!</h1>
+    <p>このウィンドウを閉じて、ターミナルに戻ってください。</p>
+</body>
+</html>
+""".encode('utf-8')
+
+# __ERROR__ をエスケープ済みのエラーメッセージで置換して使う
+ERROR_HTML_TEMPLATE = """
+<html>
+<head><title>認証エラー</title></head>
+<body style="font-family: sans-serif; text-align: center; padding-top: 50px;">
+    <h1 style="color: red;">認証エラー</h1>
+    <p>__ERROR__</p>
+</body>
+</html>
+""".encode('utf-8')
+
 
 class CallbackHandler(http.server.BaseHTTPRequestHandler):
     """OAuth2コールバックを処理するHTTPハンドラー"""
@@ -56,31 +84,14 @@ class CallbackHandler(http.server.BaseHTTPRequestHandler):
                 self.send_response(200)
                 self.send_header('Content-type', 'text/html; charset=utf-8')
                 self.end_headers()
-                response = """
-                <html>
-                <head><title>認証成功</title></head>
-                <body style="font-family: sans-serif; text-align: center; padding-top: 50px;">
-                    <h1 style="color: green;">認証成功!</h1>
-                    <p>このウィンドウを閉じて、ターミナルに戻ってください。</p>
-                </body>
-                </html>
-                """
-                self.wfile.write(response.encode('utf-8'))
+                self.wfile.write(SUCCESS_HTML)
             elif 'error' in query:
                 CallbackHandler.error = query.get('error_description', query['error'])[0]
                 self.send_response(400)
                 self.send_header('Content-type', 'text/html; charset=utf-8')
                 self.end_headers()
-                response = """
-                <html>
-                <head><title>認証エラー</title></head>
-                <body style="font-family: sans-serif; text-align: center; padding-top: 50px;">
-                    <h1 style="color: red;">認証エラー</h1>
-                    <p>{error}</p>
-                </body>
-                </html>
-                """.format(error=CallbackHandler.error)
-                self.wfile.write(response.encode('utf-8'))
+                error = html.escape(CallbackHandler.error).encode('utf-8')
+                self.wfile.write(ERROR_HTML_TEMPLATE.replace(b'__ERROR__', error))
             else:
                 self.send_response(400)
                 self.end_headers()
@@ -104,8 +115,13 @@ def get_authorization_url(client_id, state="netatmo_auth"):
     return AUTH_URL + "?" + urllib.parse.urlencode(params)
 
 
-def exchange_code_for_tokens(client_id, client_secret, authorization_code):
-    """認可コードをトークンに交換"""
+def exchange_code_for_tokens(client_id, client_secret, authorization_code, session=None):
+    """
+    認可コードをトークンに交換
+
+    session を渡すと（例: NetatmoAPI と共有の requests.Session）、
+    確立したTLS接続がその後のAPI呼び出しで再利用される
+    """
     payload = {
         'grant_type': 'authorization_code',
         'client_id': client_id,
@@ -119,7 +135,8 @@ def exchange_code_for_tokens(client_id, client_secret, authorization_code):
         'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8'
     }
 
-    response = requests.post(TOKEN_URL, data=payload, headers=headers, timeout=30)
+    post = session.post if session is not None else requests.post
+    response = post(TOKEN_URL, data=payload, headers=headers, timeout=30)
 
     if response.status_code != 200:
         raise Exception("Token exchange failed: {} - {}".format(
@@ -131,26 +148,23 @@ def exchange_code_for_tokens(client_id, client_secret, authorization_code):
 
 def start_callback_server():
     """コールバック用の一時HTTPサーバーを起動"""
-    handler = CallbackHandler
-
-    # SO_REUSEADDR を設定
-    socketserver.TCPServer.allow_reuse_address = True
-
-    server = socketserver.TCPServer(("", CALLBACK_PORT), handler)
-
-    # タイムアウト設定
-    server.timeout = 300  # 5分
-
-    return server
+    # HTTPServer は SO_REUSEADDR を設定済み
+    return http.server.HTTPServer(("", CALLBACK_PORT), CallbackHandler)
 
 
-def wait_for_callback(server):
-    """コールバックを待機"""
+def wait_for_callback(server, timeout=CALLBACK_TIMEOUT_SECONDS):
+    """コールバックを待機（favicon等の無関係なリクエストは無視して待ち続ける）"""
     CallbackHandler.authorization_code = None
     CallbackHandler.error = None
 
-    # 1リクエストだけ処理
-    server.handle_request()
+    deadline = time.monotonic() + timeout
+    while CallbackHandler.authorization_code is None and CallbackHandler.error is None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # 次のリクエストを残り時間だけ待つ（来なければ戻る）
+        server.timeout = remaining
+        server.handle_request()
 
     return CallbackHandler.authorization_code, CallbackHandler.error
 
@@ -163,8 +177,7 @@ def save_credentials(client_id, client_secret, refresh_token, filepath):
         'refresh_token': refresh_token
     }
 
-    with open(filepath, 'w') as f:
-        json.dump(credentials, f, indent=2)
+    json_utils.dump_file_atomic(credentials, filepath)
 
 
 def main():
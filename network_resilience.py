@@ -10,6 +10,10 @@ import threading
 import time
 import functools
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 
 class NetworkHealthChecker:
     """
@@ -213,3 +217,39 @@ def retry_with_backoff(func=None, max_retries=3, base_delay=1, max_delay=30,
     if func is not None:
         return decorator(func)
     return decorator
+
+
+# Transient statuses retried by the transport (429 honours Retry-After)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def create_http_session(pool_maxsize=10, retries=3):
+    """
+    Create a requests.Session with a keep-alive connection pool.
+
+    Reusing one session across API clients avoids a new TCP+TLS handshake
+    for every request. Idempotent requests (GET etc., not POST) are retried
+    on connection errors and RETRY_STATUS_CODES with exponential backoff,
+    waiting for Retry-After on 429. After the last attempt the response is
+    returned as-is so callers' status handling still applies.
+
+    Args:
+        pool_maxsize: Maximum connections kept per host (>= concurrent requests)
+        retries: Transport-level retry count (0 to disable)
+
+    Returns:
+        requests.Session: Session with HTTP(S) adapters mounted
+    """
+    session = requests.Session()
+    max_retries = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize,
+                          max_retries=max_retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -4,19 +4,30 @@ Slack notification module using Incoming Webhooks.
 Python 3.7+ compatible, requires only requests library.
 Supports multiple channels for different notification types.
 """
-import json
+import hashlib
 import logging
+import threading
+import time
 import requests
+from collections import deque, namedtuple
 from datetime import datetime
 
-from network_resilience import CircuitBreaker
+import json_utils
+from network_resilience import CircuitBreaker, create_http_session
+
+
+# Latest values of one device for the graph report summary (None = no value)
+SensorLatest = namedtuple('SensorLatest', (
+    'temperature', 'humidity', 'co2', 'pressure', 'noise',
+    'wind_strength', 'gust_strength', 'rain', 'rain_24h', 'light_level'
+))
 
 
 class SlackNotifier:
     """Send notifications to Slack via Incoming Webhooks."""
 
     # Security device types
-    SECURITY_DEVICE_TYPES = [
+    SECURITY_DEVICE_TYPES = frozenset([
         'Smart Lock', 'Smart Lock Pro', 'Lock',
         'Contact Sensor', 'Motion Sensor',
         'Keypad', 'Keypad Touch',
@@ -25,26 +36,90 @@ class SlackNotifier:
         'Pan/Tilt Cam', 'Pan/Tilt Cam 2K', 'Pan/Tilt Cam Plus 3K',
         'WoPanTiltCam', 'WoPanTiltCam2K', 'WoCamKvs3mp',
         'Outdoor Spotlight Cam', 'Outdoor Spotlight Cam 2K',
-    ]
+    ])
 
     # Atmosphere sensor device types
-    ATMOS_DEVICE_TYPES = [
+    ATMOS_DEVICE_TYPES = frozenset([
         'Meter', 'MeterPlus', 'MeterPro', 'MeterPro(CO2)',
         'WoIOSensor', 'Hub 2', 'Outdoor Meter'
-    ]
+    ])
 
     # Google Nest device types
-    NEST_DEVICE_TYPES = [
+    NEST_DEVICE_TYPES = frozenset([
         'Doorbell', 'Camera', 'Display', 'Thermostat'
-    ]
+    ])
+
+    # Category per device type (security takes precedence), see get_device_category()
+    DEVICE_CATEGORIES = dict(
+        [(t, 'atmos') for t in ATMOS_DEVICE_TYPES]
+        + [(t, 'security') for t in SECURITY_DEVICE_TYPES]
+    )
+
+    # Chart titles for the graph report (legacy 'temp_humidity' included)
+    ATMOS_CHART_TITLES = {
+        'outdoor_temp': '🌳 屋外 温度',
+        'outdoor_humidity': '🌳 屋外 湿度',
+        'indoor_temp': '🏠 屋内 温度',
+        'indoor_humidity': '🏠 屋内 湿度',
+        'co2': '🏠 CO2濃度',
+        'pressure': '🏠 気圧',
+        'noise': '🏠 騒音',
+        'wind': '🌬️ 風速・突風',
+        'wind_direction': '🧭 風向',
+        'rain': '🌧️ 雨量',
+        'light_level': '💡 照度',
+        'temp_humidity': '温度',
+    }
+
+    # Order of chart images in the graph report
+    ATMOS_CHART_ORDER = (
+        'outdoor_temp', 'outdoor_humidity',
+        'indoor_temp', 'indoor_humidity', 'co2',
+        'pressure', 'noise',
+        'wind', 'wind_direction',
+        'rain',
+        'light_level'
+    )
+
+    # Google Nest doorbell events: event type -> emoji / message / detail
+    NEST_DOORBELL_EVENTS = {
+        'chime': {
+            'emoji': '',
+            'message': 'ドアベルが押されました',
+            'detail': 'チャイムが鳴りました'
+        },
+        'motion': {
+            'emoji': '',
+            'message': '動きを検知しました',
+            'detail': 'カメラが動きを検出'
+        },
+        'person': {
+            'emoji': '',
+            'message': '人物を検知しました',
+            'detail': '人物が検出されました'
+        },
+        'sound': {
+            'emoji': '',
+            'message': '音を検知しました',
+            'detail': '音声が検出されました'
+        },
+    }
+
+    # Google Nest camera events: event type -> emoji / message
+    NEST_CAMERA_EVENTS = {
+        'motion': {'emoji': '', 'message': '動きを検知'},
+        'person': {'emoji': '', 'message': '人物を検知'},
+        'sound': {'emoji': '', 'message': '音を検知'},
+    }
 
-    def __init__(self, config, network_checker=None):
+    def __init__(self, config, network_checker=None, session=None):
         """
         Initialize Slack notifier with channel configuration.
 
         Args:
             config: Slack config dict with 'channels' and other settings
             network_checker: Optional NetworkHealthChecker instance
+            session: Optional shared requests.Session
         """
         self.enabled = config.get('enabled', True)
         self.channels = config.get('channels', {})
@@ -57,6 +132,22 @@ class SlackNotifier:
         self.network_checker = network_checker
         self.circuit_breaker = CircuitBreaker(name='Slack', failure_threshold=3, recovery_timeout=60)
 
+        # Identical payloads to the same channel within this window are sent once (0 = off)
+        self.dedupe_seconds = config.get('dedupe_seconds', 180)
+        self._recent_payloads = {}  # {payload digest: monotonic send time}
+        self._dedupe_lock = threading.Lock()
+
+        # Client-side throttle per channel (Slack webhooks allow about 1 message/second)
+        self.min_send_interval = config.get('min_send_interval_seconds', 0.5)
+        self.max_sends_per_minute = config.get('max_sends_per_minute', 60)
+        self._send_times = {}  # {channel: deque of reserved monotonic send times}
+        self._throttle_lock = threading.Lock()
+
+        # Persistent keep-alive session for webhook posts and file uploads
+        # (shared with the other clients when passed in)
+        self.session = session or create_http_session()
+        self._owns_session = session is None
+
         # Backwards compatibility: if 'webhook_url' is provided, use for all
         if 'webhook_url' in config and not self.channels:
             self.channels = {
@@ -65,6 +156,68 @@ class SlackNotifier:
                 'atmos_graph': config['webhook_url']
             }
 
+    def close(self):
+        """Close the underlying HTTP session (unless it is shared)."""
+        if self._owns_session:
+            self.session.close()
+
+    def clear_dedup(self):
+        """Forget recently sent payloads so the next identical message is sent."""
+        with self._dedupe_lock:
+            self._recent_payloads.clear()
+
+    def _claim_payload(self, channel, payload):
+        """
+        Record a payload about to be sent.
+
+        Returns:
+            bytes or None: Digest to release if sending fails, or None if the same
+                           payload was already sent to this channel within dedupe_seconds
+        """
+        digest = hashlib.blake2b(json_utils.dumps([channel, payload]), digest_size=16).digest()
+        now = time.monotonic()
+        with self._dedupe_lock:
+            expired = [
+                key for key, sent_at in self._recent_payloads.items()
+                if now - sent_at >= self.dedupe_seconds
+            ]
+            for key in expired:
+                del self._recent_payloads[key]
+
+            if digest in self._recent_payloads:
+                return None
+            self._recent_payloads[digest] = now
+        return digest
+
+    def _release_payload(self, digest):
+        """Allow a payload that failed to send to be sent again."""
+        with self._dedupe_lock:
+            self._recent_payloads.pop(digest, None)
+
+    def _reserve_send_slot(self, channel):
+        """
+        Reserve the next allowed send time for a channel.
+
+        Keeps min_send_interval between posts and at most max_sends_per_minute
+        posts in any 60 seconds, so bursts are spread out instead of hitting 429.
+
+        Returns:
+            float: Seconds to wait before posting
+        """
+        with self._throttle_lock:
+            now = time.monotonic()
+            send_times = self._send_times.setdefault(channel, deque())
+            while send_times and now - send_times[0] >= 60:
+                send_times.popleft()
+
+            send_at = now
+            if send_times:
+                send_at = max(send_at, send_times[-1] + self.min_send_interval)
+            if self.max_sends_per_minute and len(send_times) >= self.max_sends_per_minute:
+                send_at = max(send_at, send_times[-self.max_sends_per_minute] + 60)
+            send_times.append(send_at)
+        return send_at - now
+
     def _send_to_channel(self, channel, text, blocks=None):
         """
         Send a message to a specific Slack channel.
@@ -99,10 +252,21 @@ class SlackNotifier:
         if blocks:
             payload['blocks'] = blocks
 
+        digest = None
+        if self.dedupe_seconds > 0:
+            digest = self._claim_payload(channel, payload)
+            if digest is None:
+                logging.debug("[Slack] 同一メッセージのため送信スキップ: %s", channel)
+                return True
+
+        delay = self._reserve_send_slot(channel)
+        if delay > 0:
+            time.sleep(delay)
+
         try:
-            response = requests.post(
+            response = self.session.post(
                 webhook_url,
-                json=payload,
+                data=json_utils.dumps(payload),
                 headers={'Content-Type': 'application/json'},
                 timeout=(3, 7)
             )
@@ -112,6 +276,8 @@ class SlackNotifier:
         except requests.exceptions.RequestException as e:
             self.circuit_breaker.record_failure()
             logging.warning("[Slack] Failed to send to %s: %s", channel, e)
+            if digest is not None:
+                self._release_payload(digest)
             return False
 
     def upload_file(self, channel, file_path=None, file_content=None, filename=None,
@@ -170,7 +336,7 @@ class SlackNotifier:
                 return False
 
             # Get upload URL using files.getUploadURLExternal
-            url_response = requests.post(
+            url_response = self.session.post(
                 'https://slack.com/api/files.getUploadURLExternal',
                 headers=headers,
                 data={
@@ -191,13 +357,13 @@ class SlackNotifier:
             # Step 2: Upload file to URL
             if file_path:
                 with open(file_path, 'rb') as f:
-                    upload_response = requests.post(
+                    upload_response = self.session.post(
                         upload_url,
                         files={'file': f},
                         timeout=(3, 57)
                     )
             else:
-                upload_response = requests.post(
+                upload_response = self.session.post(
                     upload_url,
                     files={'file': (filename, file_content)},
                     timeout=(3, 57)
@@ -208,7 +374,7 @@ class SlackNotifier:
                 return False
 
             # Step 3: Complete upload with files.completeUploadExternal
-            complete_response = requests.post(
+            complete_response = self.session.post(
                 'https://slack.com/api/files.completeUploadExternal',
                 headers=headers,
                 json={
@@ -243,11 +409,7 @@ class SlackNotifier:
         Returns:
             str: 'security', 'atmos', or 'other'
         """
-        if device_type in self.SECURITY_DEVICE_TYPES:
-            return 'security'
-        elif device_type in self.ATMOS_DEVICE_TYPES:
-            return 'atmos'
-        return 'other'
+        return self.DEVICE_CATEGORIES.get(device_type, 'other')
 
     def _get_security_message_ja(self, device_name, device_type, status):
         """
@@ -535,7 +697,8 @@ class SlackNotifier:
 
         Args:
             date_str: Date string (YYYY-MM-DD)
-            devices_data: List of device summary dicts (with is_outdoor flag)
+            devices_data: List of device summary dicts
+                          (device_name, module_type, is_outdoor, latest: SensorLatest)
             chart_urls: Dict of chart URLs
 
         Returns:
@@ -549,11 +712,12 @@ class SlackNotifier:
 
         for device in devices_data:
             name = device.get('device_name', 'Unknown')
-            temp = device.get('temperature', {}).get('latest', '-')
-            humidity = device.get('humidity', {}).get('latest', '-')
-            co2 = device.get('co2', {}).get('latest', '-')
-            pressure = device.get('pressure', {}).get('latest', '-')
-            noise = device.get('noise', {}).get('latest', '-')
+            latest = device['latest']
+            temp = latest.temperature
+            humidity = latest.humidity
+            co2 = latest.co2
+            pressure = latest.pressure
+            noise = latest.noise
             is_outdoor = device.get('is_outdoor', False)
 
             # Get wind and rain data (only for outdoor sensors)
@@ -563,51 +727,43 @@ class SlackNotifier:
             is_wind_module = module_type == 'NAModule2'
             is_rain_module = module_type == 'NAModule3'
 
-            wind_strength = device.get('wind_strength', {}).get('latest', '-') if is_wind_module else '-'
-            gust_strength = device.get('gust_strength', {}).get('latest', '-') if is_wind_module else '-'
-            rain = device.get('rain', {}).get('latest', '-') if is_rain_module else '-'
-            rain_24h = device.get('rain_24h', {}).get('latest', '-') if is_rain_module else '-'
-            light_level = device.get('light_level', {}).get('latest', '-')
+            wind_strength = latest.wind_strength if is_wind_module else None
+            gust_strength = latest.gust_strength if is_wind_module else None
+            rain = latest.rain if is_rain_module else None
+            rain_24h = latest.rain_24h if is_rain_module else None
+            light_level = latest.light_level
 
-            has_data = any([
-                temp != '-', humidity != '-', co2 != '-',
-                pressure != '-', noise != '-',
-                wind_strength != '-', rain != '-', light_level != '-'
-            ])
+            has_data = any(value is not None for value in (
+                temp, humidity, co2, pressure, noise, wind_strength, rain, light_level
+            ))
 
             if has_data:
                 parts = []
-                if temp != '-':
-                    if isinstance(temp, (int, float)):
-                        parts.append("{:.1f}°C".format(temp))
-                    else:
-                        parts.append("{}°C".format(temp))
-                if humidity != '-':
+                if temp is not None:
+                    parts.append("{:.1f}°C".format(temp))
+                if humidity is not None:
                     parts.append("{}%".format(humidity))
-                if co2 != '-':
+                if co2 is not None:
                     parts.append("{}ppm".format(co2))
-                if pressure != '-':
-                    if isinstance(pressure, (int, float)):
-                        parts.append("{:.1f}hPa".format(pressure))
-                    else:
-                        parts.append("{}hPa".format(pressure))
-                if noise != '-':
+                if pressure is not None:
+                    parts.append("{:.1f}hPa".format(pressure))
+                if noise is not None:
                     parts.append("{}dB".format(noise))
                 # Wind data (only for NAModule2) - convert km/h to m/s
-                if wind_strength != '-':
+                if wind_strength is not None:
                     wind_ms = float(wind_strength) / 3.6
                     wind_str = "{:.1f}m/s".format(wind_ms)
-                    if gust_strength != '-':
+                    if gust_strength is not None:
                         gust_ms = float(gust_strength) / 3.6
                         wind_str += " (突風:{:.1f}m/s)".format(gust_ms)
                     parts.append(wind_str)
                 # Rain data (only for NAModule3)
-                if rain_24h != '-':
+                if rain_24h is not None:
                     parts.append("{}mm/24h".format(rain_24h))
-                elif rain != '-':
+                elif rain is not None:
                     parts.append("{}mm".format(rain))
                 # Light level data (SwitchBot Hub 2, Contact/Motion Sensor)
-                if light_level != '-':
+                if light_level is not None:
                     parts.append("照度:{}".format(light_level))
 
                 line = "*{}*: {}".format(name, " / ".join(parts))
@@ -646,38 +802,12 @@ class SlackNotifier:
             }
         ]
 
-        # Chart titles mapping
-        chart_titles = {
-            'outdoor_temp': '🌳 屋外 温度',
-            'outdoor_humidity': '🌳 屋外 湿度',
-            'indoor_temp': '🏠 屋内 温度',
-            'indoor_humidity': '🏠 屋内 湿度',
-            'co2': '🏠 CO2濃度',
-            'pressure': '🏠 気圧',
-            'noise': '🏠 騒音',
-            'wind': '🌬️ 風速・突風',
-            'wind_direction': '🧭 風向',
-            'rain': '🌧️ 雨量',
-            'light_level': '💡 照度',
-            # Legacy keys
-            'temp_humidity': '温度',
-        }
-
         # Add chart images in specific order
-        chart_order = [
-            'outdoor_temp', 'outdoor_humidity',
-            'indoor_temp', 'indoor_humidity', 'co2',
-            'pressure', 'noise',
-            'wind', 'wind_direction',
-            'rain',
-            'light_level'
-        ]
-
         if chart_urls:
-            for chart_name in chart_order:
+            for chart_name in self.ATMOS_CHART_ORDER:
                 url = chart_urls.get(chart_name)
                 if url:
-                    chart_title = chart_titles.get(chart_name, chart_name)
+                    chart_title = self.ATMOS_CHART_TITLES.get(chart_name, chart_name)
 
                     blocks.append({
                         "type": "image",
@@ -822,31 +952,7 @@ class SlackNotifier:
         """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        # Event type to Japanese message and emoji
-        event_config = {
-            'chime': {
-                'emoji': '',
-                'message': 'ドアベルが押されました',
-                'detail': 'チャイムが鳴りました'
-            },
-            'motion': {
-                'emoji': '',
-                'message': '動きを検知しました',
-                'detail': 'カメラが動きを検出'
-            },
-            'person': {
-                'emoji': '',
-                'message': '人物を検知しました',
-                'detail': '人物が検出されました'
-            },
-            'sound': {
-                'emoji': '',
-                'message': '音を検知しました',
-                'detail': '音声が検出されました'
-            },
-        }
-
-        config = event_config.get(event_type, {
+        config = self.NEST_DOORBELL_EVENTS.get(event_type, {
             'emoji': '',
             'message': 'イベントが発生しました',
             'detail': event_type
@@ -864,29 +970,30 @@ class SlackNotifier:
                     "type": "mrkdwn",
                     "text": "*{} {}*\n{}".format(emoji, message, device_name)
                 }
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "Google Nest {} | {}".format(
-                            'Doorbell' if event_type == 'chime' else 'Camera',
-                            timestamp
-                        )
-                    }
-                ]
             }
         ]
 
         # Add image if available in event_data
         if event_data and event_data.get('image_url'):
-            blocks.insert(1, {
+            blocks.append({
                 "type": "image",
                 "image_url": event_data['image_url'],
                 "alt_text": "{} - {}".format(device_name, message)
             })
 
+        blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": "Google Nest {} | {}".format(
+                        'Doorbell' if event_type == 'chime' else 'Camera',
+                        timestamp
+                    )
+                }
+            ]
+        })
+
         return self._send_to_channel('home_security', text, blocks)
 
     def notify_nest_camera_event(self, device_name, event_type, zone_name=None, clip_url=None):
@@ -904,13 +1011,7 @@ class SlackNotifier:
         """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        event_config = {
-            'motion': {'emoji': '', 'message': '動きを検知'},
-            'person': {'emoji': '', 'message': '人物を検知'},
-            'sound': {'emoji': '', 'message': '音を検知'},
-        }
-
-        config = event_config.get(event_type, {'emoji': '', 'message': event_type})
+        config = self.NEST_CAMERA_EVENTS.get(event_type, {'emoji': '', 'message': event_type})
         emoji = config['emoji']
         message = config['message']
 
@@ -9,7 +9,9 @@ import hmac
 import base64
 import uuid
 import json
-import requests
+
+import json_utils
+from network_resilience import create_http_session
 
 
 class SwitchBotAPI:
@@ -17,16 +19,26 @@ class SwitchBotAPI:
 
     BASE_URL = "https://api.switch-bot.com/v1.1"
 
-    def __init__(self, token, secret):
+    def __init__(self, token, secret, session=None):
         """
         Initialize SwitchBot API client.
 
         Args:
             token: API token from SwitchBot app
             secret: API secret key from SwitchBot app
+            session: Optional shared requests.Session
         """
         self.token = token
         self.secret = secret
+        # Persistent keep-alive session (status polls run concurrently)
+        # (shared with the other clients when passed in)
+        self.session = session or create_http_session()
+        self._owns_session = session is None
+
+    def close(self):
+        """Close the underlying HTTP session (unless it is shared)."""
+        if self._owns_session:
+            self.session.close()
 
     def _generate_headers(self):
         """Generate authentication headers for API request."""
@@ -70,14 +82,14 @@ class SwitchBotAPI:
         headers = self._generate_headers()
 
         if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, timeout=(5, 25))
+            response = self.session.get(url, headers=headers, timeout=(5, 25))
         elif method.upper() == 'POST':
-            response = requests.post(url, headers=headers, json=data, timeout=(5, 25))
+            response = self.session.post(url, headers=headers, json=data, timeout=(5, 25))
         else:
             raise ValueError("Unsupported HTTP method: {}".format(method))
 
         response.raise_for_status()
-        result = response.json()
+        result = json_utils.loads(response.content)
 
         if result.get('statusCode') != 100:
             raise ValueError("API error: {} - {}".format(
@@ -6,8 +6,14 @@ Python 3.7+ compatible, uses only standard library.
 import json
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+import json_utils
+
+# Worker threads serving webhook connections (handlers only parse and enqueue)
+WEBHOOK_HTTP_WORKERS = 4
+
 
 class WebhookHandler(BaseHTTPRequestHandler):
     """HTTP request handler for SwitchBot webhooks."""
@@ -16,6 +22,9 @@ class WebhookHandler(BaseHTTPRequestHandler):
     callback = None
     webhook_path = '/switchbot/webhook'
 
+    # Per-connection socket timeout (a stalled client only ties up one worker)
+    timeout = 10
+
     def log_message(self, format, *args):
         """Override to use logging module."""
         logging.debug("Webhook HTTP: %s", format % args)
@@ -56,7 +65,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
 
         try:
             body = self.rfile.read(content_length)
-            event_data = json.loads(body.decode('utf-8'))
+            event_data = json_utils.loads(body)
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             logging.error("Failed to parse webhook body: %s", e)
             self._send_response(400, {'error': 'Invalid JSON'})
@@ -64,17 +73,51 @@ class WebhookHandler(BaseHTTPRequestHandler):
 
         logging.debug("Received webhook event: %s", event_data)
 
-        # Process event via callback
+        # Process event via callback (returning False means it could not be accepted)
         if self.callback:
             try:
-                self.callback(event_data)
+                accepted = self.callback(event_data)
             except Exception as e:
                 logging.error("Webhook callback error: %s", e)
+            else:
+                if accepted is False:
+                    # Backpressure: let SwitchBot retry later instead of losing the event
+                    self._send_response(503, {'error': 'Busy'})
+                    return
 
-        # Always respond 200 to SwitchBot
+        # Respond 200 to SwitchBot
         self._send_response(200, {'status': 'received'})
 
 
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer that hands each connection to a fixed worker pool.
+    Like ThreadingHTTPServer, but without starting a new thread per request.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers=WEBHOOK_HTTP_WORKERS):
+        super().__init__(server_address, handler_class)
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='webhook-http')
+
+    def process_request(self, request, client_address):
+        """Queue the connection for a worker (called from serve_forever)."""
+        self._workers.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        """Same as ThreadingMixIn.process_request_thread."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        """Close the listening socket and stop the workers."""
+        super().server_close()
+        self._workers.shutdown(wait=False)
+
+
 class WebhookServer:
     """Threaded HTTP server for webhooks."""
 
@@ -85,7 +128,8 @@ class WebhookServer:
         Args:
             port: Port to listen on
             path: URL path for webhook endpoint
-            callback: Function to call with event data
+            callback: Function to call with event data; returning False
+                      responds 503 so the sender retries
         """
         self.port = port
         self.path = path
@@ -99,35 +143,25 @@ class WebhookServer:
         WebhookHandler.callback = self.callback
         WebhookHandler.webhook_path = self.path
 
-        # Create server
-        self.server = HTTPServer(('0.0.0.0', self.port), WebhookHandler)
-        self.server.socket.settimeout(1)  # Allow periodic checks for shutdown
+        # Create server (connections are served by a small worker pool)
+        self.server = PooledHTTPServer(('0.0.0.0', self.port), WebhookHandler)
 
         # Start in background thread
-        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.5}, daemon=True
+        )
         self.thread.start()
 
         logging.info("Webhook server started on port %d, path: %s", self.port, self.path)
 
-    def _serve(self):
-        """Server loop with graceful shutdown support."""
-        while True:
-            try:
-                self.server.handle_request()
-            except Exception as e:
-                if self.server is None:
-                    break  # Server was stopped
-                logging.debug("Server handle_request: %s", e)
-
     def stop(self):
         """Stop the webhook server."""
         if self.server:
             logging.info("Stopping webhook server...")
             server = self.server
             self.server = None
-            # Don't call shutdown() - we use custom loop with handle_request()
-            # Just close the socket; the daemon thread will exit on its own
             try:
+                server.shutdown()  # returns once serve_forever exits (<= poll_interval)
                 server.server_close()
             except Exception:
                 pass